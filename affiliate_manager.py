@@ -1,13 +1,91 @@
+import asyncio
+import functools
 import os
 import logging
 import re
 from dotenv import load_dotenv
 
+import fast_extract
+
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+# Product ID patterns, precompiled once at module load so link conversion
+# doesn't pay for re's pattern-cache lookup on every call
+_NOON_PRODUCT_PATTERN = re.compile(r'/([A-Za-z0-9]+)(?:\?.*)?$')
+_TEMU_PRODUCT_PATTERN = re.compile(r'product_([0-9]+)\.html')
+
+@functools.lru_cache(maxsize=4096)
+def _amazon_link(url, partner_tag):
+    """Build the tag-based Amazon affiliate URL, cached per (url, tag)."""
+    # Extract ASIN if present; a literal find + fixed-width slice is far
+    # cheaper than running the regex engine over the URL
+    asin = fast_extract.extract_asin(url)
+    if asin:
+        # Simple tag-based approach; a single join avoids intermediate strings
+        return "".join(("https://www.amazon.com/dp/", asin, "?tag=", partner_tag))
+
+    # If no ASIN found, just append the tag to the URL
+    separator = '&' if '?' in url else '?'
+    return "".join((url, separator, "tag=", partner_tag))
+
+@functools.lru_cache(maxsize=4096)
+def _aliexpress_link(url, tracking_id):
+    """Build the AliExpress affiliate URL, cached per (url, tracking id)."""
+    # Extract product ID if present; a literal find + slice is far
+    # cheaper than running the regex engine over the URL
+    product_id = fast_extract.extract_aliexpress_item_id(url)
+    if product_id:
+        # Simple parameter-based approach; a single join avoids intermediate strings
+        return "".join((
+            "https://www.aliexpress.com/item/", product_id,
+            ".html?aff_platform=portals-tool&sk=_dYQF9xF&aff_trace_key=",
+            tracking_id
+        ))
+
+    # If no product ID found, just append the tracking ID to the URL
+    separator = '&' if '?' in url else '?'
+    return "".join((url, separator, "aff_trace_key=", tracking_id))
+
+@functools.lru_cache(maxsize=4096)
+def _noon_link(url, affiliate_id):
+    """Build the Noon affiliate URL, cached per (url, affiliate id)."""
+    # Extract product ID if present
+    product_id_match = _NOON_PRODUCT_PATTERN.search(url)
+    if product_id_match:
+        # Simple parameter-based approach; a single join avoids intermediate strings
+        return "".join((
+            "https://www.noon.com/product/", product_id_match.group(1),
+            "?utm_source=affiliate&utm_medium=cps&utm_campaign=",
+            affiliate_id
+        ))
+
+    # If no product ID found, just append the affiliate ID to the URL
+    separator = '&' if '?' in url else '?'
+    return "".join((
+        url, separator,
+        "utm_source=affiliate&utm_medium=cps&utm_campaign=",
+        affiliate_id
+    ))
+
+@functools.lru_cache(maxsize=4096)
+def _temu_link(url, affiliate_id):
+    """Build the Temu affiliate URL, cached per (url, affiliate id)."""
+    # Extract product ID if present
+    product_id_match = _TEMU_PRODUCT_PATTERN.search(url)
+    if product_id_match:
+        # Simple parameter-based approach; a single join avoids intermediate strings
+        return "".join((
+            "https://www.temu.com/product_", product_id_match.group(1),
+            ".html?refer_key=", affiliate_id
+        ))
+
+    # If no product ID found, just append the affiliate ID to the URL
+    separator = '&' if '?' in url else '?'
+    return "".join((url, separator, "refer_key=", affiliate_id))
+
 class AffiliateManager:
     """Class for managing affiliate links for different platforms."""
     
@@ -31,28 +109,43 @@ class AffiliateManager:
         # Temu affiliate settings
         self.temu_affiliate_id = os.getenv("TEMU_AFFILIATE_ID")
         self.temu_api_key = os.getenv("TEMU_API_KEY")
-    
+
+        # Platforms whose affiliate credentials are configured; checked once
+        # here instead of per product inside every link creator
+        self._enabled = {
+            platform for platform, credential in (
+                ('amazon', self.amazon_partner_tag),
+                ('aliexpress', self.aliexpress_tracking_id),
+                ('noon', self.noon_affiliate_id),
+                ('temu', self.temu_affiliate_id)
+            ) if credential
+        }
+
+        # Dispatch table mapping platform names to link creators, so
+        # conversion is a single dict lookup instead of an if/elif chain
+        self._dispatch = {
+            'amazon': self.create_amazon_affiliate_link,
+            'aliexpress': self.create_aliexpress_affiliate_link,
+            'noon': self.create_noon_affiliate_link,
+            'temu': self.create_temu_affiliate_link
+        }
+
     def convert_to_affiliate_link(self, url, platform):
         """
         Convert a regular product URL to an affiliate URL.
-        
+
         Args:
             url (str): The original product URL
             platform (str): The platform name
-            
+
         Returns:
             str: The affiliate URL
         """
-        if platform.lower() == 'amazon':
-            return self.create_amazon_affiliate_link(url)
-        elif platform.lower() == 'aliexpress':
-            return self.create_aliexpress_affiliate_link(url)
-        elif platform.lower() == 'noon':
-            return self.create_noon_affiliate_link(url)
-        elif platform.lower() == 'temu':
-            return self.create_temu_affiliate_link(url)
-        else:
-            return url  # Return original URL if platform not supported
+        platform = platform.lower()
+        if platform not in self._enabled:
+            return url  # No credentials or unsupported platform
+
+        return self._dispatch[platform](url)
     
     def create_amazon_affiliate_link(self, url):
         """
@@ -66,27 +159,15 @@ class AffiliateManager:
         """
         if not self.amazon_partner_tag:
             return url
-        
-        # Extract ASIN if present
-        asin_match = re.search(r'/dp/([A-Z0-9]{10})', url)
-        if asin_match:
-            asin = asin_match.group(1)
-            
-            # If we have PA-API credentials, we could use the API to generate the link
-            if all([self.amazon_access_key, self.amazon_secret_key, self.amazon_partner_tag]):
-                # TODO: Implement PA-API call for more advanced affiliate link generation
-                # For now, we'll use a simple tag-based approach
-                pass
-            
-            # Simple tag-based approach
-            base_url = f"https://www.amazon.com/dp/{asin}"
-            return f"{base_url}?tag={self.amazon_partner_tag}"
-        
-        # If no ASIN found, just append the tag to the URL
-        if '?' in url:
-            return f"{url}&tag={self.amazon_partner_tag}"
-        else:
-            return f"{url}?tag={self.amazon_partner_tag}"
+
+        # If we have PA-API credentials, we could use the API to generate the link
+        if all([self.amazon_access_key, self.amazon_secret_key, self.amazon_partner_tag]):
+            # TODO: Implement PA-API call for more advanced affiliate link generation
+            # For now, we'll use a simple tag-based approach
+            pass
+
+        # The tag is part of the cache key, so rotating it invalidates entries
+        return _amazon_link(url, self.amazon_partner_tag)
     
     def create_aliexpress_affiliate_link(self, url):
         """
@@ -100,27 +181,15 @@ class AffiliateManager:
         """
         if not self.aliexpress_tracking_id:
             return url
-        
-        # Extract product ID if present
-        product_id_match = re.search(r'/item/(\d+)\.html', url)
-        if product_id_match:
-            product_id = product_id_match.group(1)
-            
-            # If we have API credentials, we could use the API to generate the link
-            if all([self.aliexpress_api_key, self.aliexpress_tracking_id]):
-                # TODO: Implement API call for more advanced affiliate link generation
-                # For now, we'll use a simple parameter-based approach
-                pass
-            
-            # Simple parameter-based approach
-            base_url = f"https://www.aliexpress.com/item/{product_id}.html"
-            return f"{base_url}?aff_platform=portals-tool&sk=_dYQF9xF&aff_trace_key={self.aliexpress_tracking_id}"
-        
-        # If no product ID found, just append the tracking ID to the URL
-        if '?' in url:
-            return f"{url}&aff_trace_key={self.aliexpress_tracking_id}"
-        else:
-            return f"{url}?aff_trace_key={self.aliexpress_tracking_id}"
+
+        # If we have API credentials, we could use the API to generate the link
+        if all([self.aliexpress_api_key, self.aliexpress_tracking_id]):
+            # TODO: Implement API call for more advanced affiliate link generation
+            # For now, we'll use a simple parameter-based approach
+            pass
+
+        # The tracking ID is part of the cache key, so rotating it invalidates entries
+        return _aliexpress_link(url, self.aliexpress_tracking_id)
     
     def create_noon_affiliate_link(self, url):
         """
@@ -134,27 +203,15 @@ class AffiliateManager:
         """
         if not self.noon_affiliate_id:
             return url
-        
-        # Extract product ID if present
-        product_id_match = re.search(r'/([A-Za-z0-9]+)(?:\?.*)?$', url)
-        if product_id_match:
-            product_id = product_id_match.group(1)
-            
-            # If we have API credentials, we could use the API to generate the link
-            if self.noon_api_key:
-                # TODO: Implement API call for more advanced affiliate link generation
-                # For now, we'll use a simple parameter-based approach
-                pass
-            
-            # Simple parameter-based approach
-            base_url = f"https://www.noon.com/product/{product_id}"
-            return f"{base_url}?utm_source=affiliate&utm_medium=cps&utm_campaign={self.noon_affiliate_id}"
-        
-        # If no product ID found, just append the affiliate ID to the URL
-        if '?' in url:
-            return f"{url}&utm_source=affiliate&utm_medium=cps&utm_campaign={self.noon_affiliate_id}"
-        else:
-            return f"{url}?utm_source=affiliate&utm_medium=cps&utm_campaign={self.noon_affiliate_id}"
+
+        # If we have API credentials, we could use the API to generate the link
+        if self.noon_api_key:
+            # TODO: Implement API call for more advanced affiliate link generation
+            # For now, we'll use a simple parameter-based approach
+            pass
+
+        # The affiliate ID is part of the cache key, so rotating it invalidates entries
+        return _noon_link(url, self.noon_affiliate_id)
     
     def create_temu_affiliate_link(self, url):
         """
@@ -168,27 +225,15 @@ class AffiliateManager:
         """
         if not self.temu_affiliate_id:
             return url
-        
-        # Extract product ID if present
-        product_id_match = re.search(r'product_([0-9]+)\.html', url)
-        if product_id_match:
-            product_id = product_id_match.group(1)
-            
-            # If we have API credentials, we could use the API to generate the link
-            if self.temu_api_key:
-                # TODO: Implement API call for more advanced affiliate link generation
-                # For now, we'll use a simple parameter-based approach
-                pass
-            
-            # Simple parameter-based approach
-            base_url = f"https://www.temu.com/product_{product_id}.html"
-            return f"{base_url}?refer_key={self.temu_affiliate_id}"
-        
-        # If no product ID found, just append the affiliate ID to the URL
-        if '?' in url:
-            return f"{url}&refer_key={self.temu_affiliate_id}"
-        else:
-            return f"{url}?refer_key={self.temu_affiliate_id}"
+
+        # If we have API credentials, we could use the API to generate the link
+        if self.temu_api_key:
+            # TODO: Implement API call for more advanced affiliate link generation
+            # For now, we'll use a simple parameter-based approach
+            pass
+
+        # The affiliate ID is part of the cache key, so rotating it invalidates entries
+        return _temu_link(url, self.temu_affiliate_id)
     
     def process_products_with_affiliate_links(self, products):
         """
@@ -200,12 +245,66 @@ class AffiliateManager:
         Returns:
             list: List of products with affiliate links added
         """
+        # Nothing to do when no platform has credentials configured
+        if not self._enabled:
+            return products
+
         for product in products:
             platform = product.get('platform', '')
             url = product.get('url', '')
-            
+
             if platform and url:
                 affiliate_url = self.convert_to_affiliate_link(url, platform)
                 product['affiliate_url'] = affiliate_url
-        
+
+        return products
+
+    async def _convert_async(self, product):
+        """
+        Convert a single product's URL to an affiliate URL.
+
+        Currently pure string work; this is the seam where the planned
+        PA-API / platform API calls will land, so each product conversion
+        can await its own network request.
+
+        Args:
+            product (dict): Product dictionary with platform and url
+
+        Returns:
+            dict: The product with affiliate_url added
+        """
+        product['affiliate_url'] = self.convert_to_affiliate_link(
+            product['url'], product['platform']
+        )
+        return product
+
+    async def process_products_with_affiliate_links_async(self, products):
+        """
+        Process a list of products to add affiliate links concurrently.
+
+        Conversions run through asyncio.gather, so once the API-backed link
+        generation lands, a batch of N products takes roughly the latency of
+        the slowest remote call instead of their sum.
+
+        Args:
+            products (list): List of product dictionaries
+
+        Returns:
+            list: List of products with affiliate links added
+        """
+        if not self._enabled:
+            return products
+
+        tasks = [
+            self._convert_async(product)
+            for product in products
+            if product.get('platform') and product.get('url')
+        ]
+
+        if tasks:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error generating affiliate link: {str(result)}")
+
         return products
@@ -1,5 +1,10 @@
 import os
 import logging
+import re
+import sys
+from collections import defaultdict
+from enum import IntEnum
+from types import MappingProxyType
 from dotenv import load_dotenv
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ContextTypes, filters
@@ -20,111 +25,159 @@ TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 # Language settings
 DEFAULT_LANGUAGE = os.getenv("DEFAULT_LANGUAGE", "en")
 
-# Translations dictionary
+# Message ids for the per-language translation tuples
+class Msg(IntEnum):
+    WELCOME = 0
+    HELP = 1
+    LANGUAGE_SELECTION = 2
+    ENGLISH = 3
+    ARABIC = 4
+    LANGUAGE_SET = 5
+    PROCESSING = 6
+    INVALID_LINK = 7
+    UNSUPPORTED_PLATFORM = 8
+    ERROR_OCCURRED = 9
+    NO_RESULTS = 10
+    BEST_PRICE = 11
+    PRICE = 12
+    RATING = 13
+    VIEW_PRODUCT = 14
+
+# Per-language message tuples indexed by Msg; a tuple index is a C-level
+# fetch, so each lookup hashes only the language code instead of two keys
 translations = {
-    "en": {
-        "welcome": "Welcome to the Price Comparison Bot! Send me a product link from AliExpress, Amazon, Noon, or Temu, and I'll find the best deals for you.",
-        "help": "This bot compares prices across different e-commerce platforms.\n\nCommands:\n/start - Start the bot\n/help - Show this help message\n/language - Change language\n\nJust send me a product link from AliExpress, Amazon, Noon, or Temu to get started!",
-        "language_selection": "Please select your preferred language:",
-        "english": "English",
-        "arabic": "Arabic",
-        "language_set": "Language set to English!",
-        "processing": "Processing your link... This may take a moment.",
-        "invalid_link": "Invalid link. Please send a product link from AliExpress, Amazon, Noon, or Temu.",
-        "unsupported_platform": "Sorry, this platform is not supported yet. Currently supported platforms: AliExpress, Amazon, Noon, and Temu.",
-        "error_occurred": "An error occurred while processing your request. Please try again later.",
-        "no_results": "Sorry, I couldn't find any matching products on other platforms.",
-        "best_price": "Best price found on {}:",
-        "price": "Price: {}",
-        "rating": "Rating: {}",
-        "view_product": "View Product"
-    },
-    "ar": {
-        "welcome": "مرحبًا بك في بوت مقارنة الأسعار! أرسل لي رابط منتج من AliExpress أو Amazon أو Noon أو Temu، وسأجد أفضل العروض لك.",
-        "help": "يقارن هذا البوت الأسعار عبر منصات التجارة الإلكترونية المختلفة.\n\nالأوامر:\n/start - بدء البوت\n/help - عرض رسالة المساعدة هذه\n/language - تغيير اللغة\n\nما عليك سوى إرسال رابط منتج من AliExpress أو Amazon أو Noon أو Temu للبدء!",
-        "language_selection": "يرجى اختيار لغتك المفضلة:",
-        "english": "الإنجليزية",
-        "arabic": "العربية",
-        "language_set": "تم ضبط اللغة على العربية!",
-        "processing": "جاري معالجة الرابط الخاص بك... قد يستغرق هذا لحظة.",
-        "invalid_link": "رابط غير صالح. يرجى إرسال رابط منتج من AliExpress أو Amazon أو Noon أو Temu.",
-        "unsupported_platform": "عذرًا، هذه المنصة غير مدعومة حاليًا. المنصات المدعومة حاليًا: AliExpress و Amazon و Noon و Temu.",
-        "error_occurred": "حدث خطأ أثناء معالجة طلبك. يرجى المحاولة مرة أخرى لاحقًا.",
-        "no_results": "عذرًا، لم أتمكن من العثور على أي منتجات مطابقة على المنصات الأخرى.",
-        "best_price": "أفضل سعر وجد على {}:",
-        "price": "السعر: {}",
-        "rating": "التقييم: {}",
-        "view_product": "عرض المنتج"
-    }
+    "en": (
+        "Welcome to the Price Comparison Bot! Send me a product link from AliExpress, Amazon, Noon, or Temu, and I'll find the best deals for you.",
+        "This bot compares prices across different e-commerce platforms.\n\nCommands:\n/start - Start the bot\n/help - Show this help message\n/language - Change language\n\nJust send me a product link from AliExpress, Amazon, Noon, or Temu to get started!",
+        "Please select your preferred language:",
+        "English",
+        "Arabic",
+        "Language set to English!",
+        "Processing your link... This may take a moment.",
+        "Invalid link. Please send a product link from AliExpress, Amazon, Noon, or Temu.",
+        "Sorry, this platform is not supported yet. Currently supported platforms: AliExpress, Amazon, Noon, and Temu.",
+        "An error occurred while processing your request. Please try again later.",
+        "Sorry, I couldn't find any matching products on other platforms.",
+        "Best price found on {}:",
+        "Price: {}",
+        "Rating: {}",
+        "View Product"
+    ),
+    "ar": (
+        "مرحبًا بك في بوت مقارنة الأسعار! أرسل لي رابط منتج من AliExpress أو Amazon أو Noon أو Temu، وسأجد أفضل العروض لك.",
+        "يقارن هذا البوت الأسعار عبر منصات التجارة الإلكترونية المختلفة.\n\nالأوامر:\n/start - بدء البوت\n/help - عرض رسالة المساعدة هذه\n/language - تغيير اللغة\n\nما عليك سوى إرسال رابط منتج من AliExpress أو Amazon أو Noon أو Temu للبدء!",
+        "يرجى اختيار لغتك المفضلة:",
+        "الإنجليزية",
+        "العربية",
+        "تم ضبط اللغة على العربية!",
+        "جاري معالجة الرابط الخاص بك... قد يستغرق هذا لحظة.",
+        "رابط غير صالح. يرجى إرسال رابط منتج من AliExpress أو Amazon أو Noon أو Temu.",
+        "عذرًا، هذه المنصة غير مدعومة حاليًا. المنصات المدعومة حاليًا: AliExpress و Amazon و Noon و Temu.",
+        "حدث خطأ أثناء معالجة طلبك. يرجى المحاولة مرة أخرى لاحقًا.",
+        "عذرًا، لم أتمكن من العثور على أي منتجات مطابقة على المنصات الأخرى.",
+        "أفضل سعر وجد على {}:",
+        "السعر: {}",
+        "التقييم: {}",
+        "عرض المنتج"
+    )
 }
 
-# User language preferences
-user_languages = {}
+# Intern the language codes and message strings so the per-update dict lookup
+# compares interned keys by identity, and freeze the table against mutation
+translations = MappingProxyType({
+    sys.intern(language): tuple(sys.intern(message) for message in messages)
+    for language, messages in translations.items()
+})
+
+def t(language, key):
+    """Get the message for a Msg id in the given language, defaulting to English."""
+    return translations.get(language, translations["en"])[key]
+
+# User language preferences; a defaultdict makes the common read a single
+# hashed lookup instead of a .get call with a default on every handler
+user_languages = defaultdict(lambda: DEFAULT_LANGUAGE)
+
+# Compiled URL extractor, shared by all incoming messages; one regex pass both
+# detects and extracts links instead of a substring check plus a re-scan
+_URL_RE = re.compile(r'https?://\S+')
+
+# The language selection keyboard is immutable per-process; build it once
+_LANG_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("English", callback_data="lang_en"),
+        InlineKeyboardButton("العربية", callback_data="lang_ar"),
+    ]
+])
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send a welcome message when the command /start is issued."""
     user_id = update.effective_user.id
-    language = user_languages.get(user_id, DEFAULT_LANGUAGE)
+    language = user_languages[user_id]
     
-    await update.message.reply_text(translations[language]["welcome"])
+    await update.message.reply_text(t(language, Msg.WELCOME))
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send a help message when the command /help is issued."""
     user_id = update.effective_user.id
-    language = user_languages.get(user_id, DEFAULT_LANGUAGE)
+    language = user_languages[user_id]
     
-    await update.message.reply_text(translations[language]["help"])
+    await update.message.reply_text(t(language, Msg.HELP))
 
 async def language_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle the /language command to change language."""
-    keyboard = [
-        [
-            InlineKeyboardButton("English", callback_data="lang_en"),
-            InlineKeyboardButton("العربية", callback_data="lang_ar"),
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
     user_id = update.effective_user.id
-    language = user_languages.get(user_id, DEFAULT_LANGUAGE)
+    language = user_languages[user_id]
     
     await update.message.reply_text(
-        translations[language]["language_selection"],
-        reply_markup=reply_markup
+        t(language, Msg.LANGUAGE_SELECTION),
+        reply_markup=_LANG_KEYBOARD
+    )
+
+async def _handle_lang_callback(update: Update, payload: str) -> None:
+    """Set the user's language from a lang_* button press."""
+    user_id = update.effective_user.id
+    user_languages[user_id] = payload
+
+    await update.callback_query.edit_message_text(
+        text=t(payload, Msg.LANGUAGE_SET)
     )
 
+# Callback handlers keyed by the prefix before the first underscore; new
+# callback kinds only need an entry here instead of another startswith branch
+_CALLBACK_HANDLERS = {
+    'lang': _handle_lang_callback
+}
+
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle button callbacks."""
     query = update.callback_query
     await query.answer()
-    
-    if query.data.startswith("lang_"):
-        language_code = query.data.split("_")[1]
-        user_id = update.effective_user.id
-        user_languages[user_id] = language_code
-        
-        await query.edit_message_text(
-            text=translations[language_code]["language_set"]
-        )
+
+    prefix, _, payload = query.data.partition('_')
+    handler = _CALLBACK_HANDLERS.get(prefix)
+    if handler:
+        await handler(update, payload)
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle incoming messages that might contain product links."""
     user_id = update.effective_user.id
-    language = user_languages.get(user_id, DEFAULT_LANGUAGE)
+    language = user_languages[user_id]
     message_text = update.message.text
     
-    # Check if the message contains a URL
-    if "http" in message_text:
-        await update.message.reply_text(translations[language]["processing"])
-        
+    # Extract URLs from the message in a single regex pass
+    urls = _URL_RE.findall(message_text)
+
+    if urls:
+        await update.message.reply_text(t(language, Msg.PROCESSING))
+
         # TODO: Implement URL validation and product link processing
         # This will be implemented in the next steps
-        
+
         # For now, just respond with a placeholder message
         await update.message.reply_text("This feature will be implemented soon!")
     else:
         # If no URL is found, provide help
-        await update.message.reply_text(translations[language]["help"])
+        await update.message.reply_text(t(language, Msg.HELP))
 
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Log errors caused by updates."""
@@ -133,9 +186,9 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     # Try to notify the user about the error
     if update and update.effective_message:
         user_id = update.effective_user.id
-        language = user_languages.get(user_id, DEFAULT_LANGUAGE)
+        language = user_languages[user_id]
         
-        await update.effective_message.reply_text(translations[language]["error_occurred"])
+        await update.effective_message.reply_text(t(language, Msg.ERROR_OCCURRED))
 
 def main() -> None:
     """Start the bot."""
@@ -0,0 +1,84 @@
+"""Small in-memory TTL cache used to collapse duplicate scraping work."""
+
+import time
+
+class TTLCache:
+    """Dict-backed cache whose entries expire after a fixed number of seconds."""
+
+    def __init__(self, maxsize, ttl):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries to keep
+            ttl (float): Entry lifetime in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = {}  # key -> (expires_at, value)
+
+    def get(self, key):
+        """
+        Get a cached value.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        return value
+
+    def get_stale(self, key):
+        """
+        Get a cached value even if it has expired.
+
+        Lets callers revalidate expired entries (e.g. with a conditional
+        HTTP request) instead of rebuilding them from scratch.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            tuple: (value, fresh) — value is None if the key is missing,
+            and fresh is False when the entry has expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+
+        expires_at, value = entry
+        return value, time.monotonic() < expires_at
+
+    def set(self, key, value):
+        """
+        Store a value in the cache.
+
+        Args:
+            key: The cache key
+            value: The value to cache
+        """
+        if len(self._entries) >= self.maxsize:
+            self._evict()
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def _evict(self):
+        """Drop expired entries, then oldest-inserted entries until under maxsize."""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+        # Python dicts preserve insertion order, so the first keys are oldest
+        while len(self._entries) >= self.maxsize:
+            del self._entries[next(iter(self._entries))]
@@ -0,0 +1,62 @@
+"""Fast product-ID extraction helpers for high-volume URL processing.
+
+These are hand-rolled ``str.find``-based scanners equivalent to the fixed
+regex patterns used elsewhere: the anchors (``/dp/``, ``/gp/product/``,
+``/item/``) are literal and the IDs have a fixed shape, so a C-level find
+plus a slice replaces the regex state machine on the hot path. Callers keep
+the regex patterns as the fallback for URL shapes these scans don't cover.
+"""
+
+import string
+
+# Valid ASIN characters (uppercase letters and digits)
+_ASIN_CHARS = frozenset(string.ascii_uppercase + string.digits)
+
+def extract_asin(url):
+    """
+    Extract a 10-character Amazon ASIN from a /dp/ or /gp/product/ URL.
+
+    Args:
+        url (str): The Amazon product URL
+
+    Returns:
+        str or None: The ASIN if found, None otherwise
+    """
+    index = url.find('/dp/')
+    if index != -1:
+        asin = url[index + 4:index + 14]
+        if len(asin) == 10 and not set(asin) - _ASIN_CHARS:
+            return asin
+
+    index = url.find('/gp/product/')
+    if index != -1:
+        asin = url[index + 12:index + 22]
+        if len(asin) == 10 and not set(asin) - _ASIN_CHARS:
+            return asin
+
+    return None
+
+def extract_aliexpress_item_id(url):
+    """
+    Extract the numeric item ID from an AliExpress /item/XXXXXXXX.html URL.
+
+    Args:
+        url (str): The AliExpress product URL
+
+    Returns:
+        str or None: The item ID if found, None otherwise
+    """
+    start = url.find('/item/')
+    if start == -1:
+        return None
+
+    start += 6
+    end = url.find('.html', start)
+    if end == -1:
+        return None
+
+    item_id = url[start:end]
+    if item_id.isdigit():
+        return item_id
+
+    return None
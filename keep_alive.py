@@ -1,7 +1,6 @@
 import os
-import time
 import logging
-from flask import Flask
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from threading import Thread
 
 # Configure logging
@@ -11,21 +10,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create Flask app
-app = Flask(__name__)
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Minimal request handler that indicates the bot is running."""
 
-@app.route('/')
-def home():
-    """Return a simple message to indicate the bot is running."""
-    return "Telegram Price Comparison Bot is running!"
+    def do_GET(self):
+        """Return a simple message to indicate the bot is running."""
+        body = b"Telegram Price Comparison Bot is running!"
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        """Answer HEAD probes (common for uptime pingers) without a body."""
+        body = b"Telegram Price Comparison Bot is running!"
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        """Keep uptime pings out of the bot's log output."""
+        pass
 
 def run():
-    """Run the Flask app."""
+    """Run the keep-alive HTTP server."""
     port = int(os.environ.get('PORT', 8080))
-    app.run(host='0.0.0.0', port=port)
+    server = ThreadingHTTPServer(('0.0.0.0', port), KeepAliveHandler)
+    server.serve_forever()
 
 def keep_alive():
-    """Start a thread to run the Flask app."""
+    """Start a thread to run the keep-alive server."""
     server = Thread(target=run)
     server.daemon = True
     server.start()
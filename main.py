@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import os
 import logging
 import re
@@ -5,17 +7,21 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ContextTypes, filters
 from dotenv import load_dotenv
 
+# Load environment variables before the custom modules are imported; some of
+# them (e.g. translation_manager) read env vars at import time and no longer
+# parse .env themselves
+load_dotenv()
+
 # Import custom modules
+from caching import TTLCache
 from link_parser import LinkParser
 from scrapers import get_scraper
 from price_comparison import PriceComparison
 from affiliate_manager import AffiliateManager
 from translation_manager import TranslationManager
+from user_prefs import UserLanguageStore
 from keep_alive import keep_alive
 
-# Load environment variables
-load_dotenv()
-
 # Configure logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -29,44 +35,62 @@ TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 # Default language
 DEFAULT_LANGUAGE = os.getenv("DEFAULT_LANGUAGE", "en")
 
-# User language preferences
-user_languages = {}
+# User language preferences: bounded in memory, persisted across restarts
+user_languages = UserLanguageStore(DEFAULT_LANGUAGE)
+
+# Compiled per-message patterns; compiling once at import keeps the per-update
+# hot path out of re's internal pattern-cache lookups. The URL matcher uses a
+# bounded character class (no HTML/quote delimiters, capped length) so
+# pathological message text stays linear to scan
+_URL_RE = re.compile(r'https?://[^\s<>"\']{1,2048}')
+
+# Caches for scraped data; repeat links from any user collapse to a dict
+# lookup instead of re-running the HTTP scrape and cross-platform search
+_detail_cache = TTLCache(maxsize=10_000, ttl=3600)
+_search_cache = TTLCache(maxsize=10_000, ttl=1800)
+
+# Long-lived scraper instances, built once at import; get_scraper returns
+# singletons, so sessions and credentials are not re-created per message
+ALL_SCRAPERS = {
+    platform: get_scraper(platform)
+    for platform in ('amazon', 'aliexpress', 'noon', 'temu')
+}
 
 # Initialize modules
 link_parser = LinkParser()
 price_comparison = PriceComparison()
 affiliate_manager = AffiliateManager()
 
+# The language selection keyboard is immutable per-process; build it once
+_LANG_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("English", callback_data="lang_en"),
+        InlineKeyboardButton("العربية", callback_data="lang_ar"),
+    ]
+])
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send a welcome message when the command /start is issued."""
     user_id = update.effective_user.id
-    language = user_languages.get(user_id, DEFAULT_LANGUAGE)
+    language = user_languages.get(user_id)
     
     await update.message.reply_text(TranslationManager.get_translation("welcome", language))
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send a help message when the command /help is issued."""
     user_id = update.effective_user.id
-    language = user_languages.get(user_id, DEFAULT_LANGUAGE)
+    language = user_languages.get(user_id)
     
     await update.message.reply_text(TranslationManager.get_translation("help", language))
 
 async def language_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle the /language command to change language."""
-    keyboard = [
-        [
-            InlineKeyboardButton("English", callback_data="lang_en"),
-            InlineKeyboardButton("العربية", callback_data="lang_ar"),
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
     user_id = update.effective_user.id
-    language = user_languages.get(user_id, DEFAULT_LANGUAGE)
+    language = user_languages.get(user_id)
     
     await update.message.reply_text(
         TranslationManager.get_translation("language_selection", language),
-        reply_markup=reply_markup
+        reply_markup=_LANG_KEYBOARD
     )
 
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -77,135 +101,147 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if query.data.startswith("lang_"):
         language_code = query.data.split("_")[1]
         user_id = update.effective_user.id
-        user_languages[user_id] = language_code
+        user_languages.set(user_id, language_code)
         
         await query.edit_message_text(
             text=TranslationManager.get_translation("language_set", language_code)
         )
 
+async def _process_url(update: Update, url: str, language: str, t) -> None:
+    """Run the full comparison pipeline for one product URL."""
+    # One status message per link, edited in place as the pipeline advances;
+    # each extra reply would cost a Telegram API round-trip and count against
+    # per-chat flood limits
+    status_message = await update.message.reply_text(t("processing"))
+
+    # Parse the product link
+    parse_result = link_parser.parse_product_link(url)
+
+    if not parse_result.get('success', False):
+        error_type = parse_result.get('error', 'unknown_error')
+
+        if error_type == 'invalid_url':
+            await status_message.edit_text(t("invalid_link"))
+        elif error_type == 'unsupported_platform':
+            await status_message.edit_text(t("unsupported_platform"))
+        else:
+            await status_message.edit_text(t("error_occurred"))
+
+        return
+
+    # Get platform and product ID
+    platform = parse_result.get('platform')
+    product_id = parse_result.get('product_id')
+
+    # Get the appropriate scraper
+    scraper = get_scraper(platform)
+
+    if not scraper:
+        await status_message.edit_text(t("unsupported_platform"))
+        return
+
+    # Get product details, consulting the TTL cache first
+    detail_key = (platform, product_id)
+    product_details = _detail_cache.get(detail_key)
+
+    if product_details is None:
+        product_details = await scraper.get_product_details_async(product_id)
+        if product_details.get('success', False):
+            _detail_cache.set(detail_key, product_details)
+
+    if not product_details.get('success', False):
+        await status_message.edit_text(t("error_occurred"))
+        return
+
+    # Inform user that we're searching for the product on other platforms
+    await status_message.edit_text(t("searching"))
+
+    # Search for similar products across platforms, keyed by the
+    # normalized name tokens so equivalent titles share a cache entry
+    search_key = PriceComparison.tokenize(product_details.get('name', ''))
+    similar_products = _search_cache.get(search_key)
+
+    if similar_products is None:
+        similar_products = await price_comparison.search_across_platforms(product_details, ALL_SCRAPERS)
+        _search_cache.set(search_key, similar_products)
+
+    # Inform user that we're comparing prices
+    await status_message.edit_text(t("comparing"))
+
+    # Compare prices and sort by price
+    # The result view shows the cheapest option plus a handful of buttons
+    sorted_products = price_comparison.compare_prices(similar_products, top_k=5)
+
+    if not sorted_products:
+        await status_message.edit_text(t("no_results"))
+        return
+
+    # Inform user that we're generating affiliate links
+    await status_message.edit_text(t("generating_links"))
+
+    # Add affiliate links to products
+    products_with_affiliate = affiliate_manager.process_products_with_affiliate_links(sorted_products)
+
+    # Format results, collect the message rows, and build the inline
+    # keyboard in a single pass over the sorted products; the cheapest
+    # option gets the "view product" button, the rest are labelled with
+    # their already-translated platform name
+    formatted_results = []
+    keyboard = []
+
+    for product in price_comparison.format_comparison_results(products_with_affiliate, language):
+        label = t("view_product") if not formatted_results else product['platform']
+        keyboard.append([
+            InlineKeyboardButton(label, url=product['affiliate_url'])
+        ])
+        formatted_results.append(product)
+
+    # Create message with comparison results
+    comparison_message = TranslationManager.format_price_comparison_message(formatted_results, language)
+
+    reply_markup = InlineKeyboardMarkup(keyboard)
+
+    # Replace the status message with the comparison results and keyboard
+    await status_message.edit_text(
+        comparison_message,
+        reply_markup=reply_markup,
+        disable_web_page_preview=True
+    )
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle incoming messages that might contain product links."""
     user_id = update.effective_user.id
-    language = user_languages.get(user_id, DEFAULT_LANGUAGE)
+    language = user_languages.get(user_id)
     message_text = update.message.text
-    
+
+    # Resolve the translation lookup once; every status/error message below
+    # reuses the bound language instead of re-traversing the table
+    t = functools.partial(TranslationManager.get_translation, language=language)
+
     # Check if the message contains a URL
     if "http" in message_text:
-        await update.message.reply_text(TranslationManager.get_translation("processing", language))
-        
-        # Extract URLs from the message
-        urls = re.findall(r'https?://[^\s]+', message_text)
-        
+        # Extract URLs from the message, dropping punctuation that commonly
+        # trails links pasted mid-sentence
+        urls = [url.rstrip('.,);]') for url in _URL_RE.findall(message_text)]
+
         if not urls:
-            await update.message.reply_text(TranslationManager.get_translation("invalid_link", language))
-            return
-        
-        # Process the first URL found
-        url = urls[0]
-        
-        # Parse the product link
-        parse_result = link_parser.parse_product_link(url)
-        
-        if not parse_result.get('success', False):
-            error_type = parse_result.get('error', 'unknown_error')
-            
-            if error_type == 'invalid_url':
-                await update.message.reply_text(TranslationManager.get_translation("invalid_link", language))
-            elif error_type == 'unsupported_platform':
-                await update.message.reply_text(TranslationManager.get_translation("unsupported_platform", language))
-            else:
-                await update.message.reply_text(TranslationManager.get_translation("error_occurred", language))
-            
-            return
-        
-        # Get platform and product ID
-        platform = parse_result.get('platform')
-        product_id = parse_result.get('product_id')
-        
-        # Get the appropriate scraper
-        scraper = get_scraper(platform)
-        
-        if not scraper:
-            await update.message.reply_text(TranslationManager.get_translation("unsupported_platform", language))
-            return
-        
-        # Get product details
-        product_details = scraper.get_product_details(product_id)
-        
-        if not product_details.get('success', False):
-            await update.message.reply_text(TranslationManager.get_translation("error_occurred", language))
+            await update.message.reply_text(t("invalid_link"))
             return
-        
-        # Inform user that we're searching for the product on other platforms
-        await update.message.reply_text(TranslationManager.get_translation("searching", language))
-        
-        # Get all scrapers
-        all_scrapers = {
-            'amazon': get_scraper('amazon'),
-            'aliexpress': get_scraper('aliexpress'),
-            'noon': get_scraper('noon'),
-            'temu': get_scraper('temu')
-        }
-        
-        # Search for similar products across platforms
-        similar_products = price_comparison.search_across_platforms(product_details, all_scrapers)
-        
-        # Inform user that we're comparing prices
-        await update.message.reply_text(TranslationManager.get_translation("comparing", language))
-        
-        # Compare prices and sort by price
-        sorted_products = price_comparison.compare_prices(similar_products)
-        
-        if not sorted_products:
-            await update.message.reply_text(TranslationManager.get_translation("no_results", language))
-            return
-        
-        # Inform user that we're generating affiliate links
-        await update.message.reply_text(TranslationManager.get_translation("generating_links", language))
-        
-        # Add affiliate links to products
-        products_with_affiliate = affiliate_manager.process_products_with_affiliate_links(sorted_products)
-        
-        # Format comparison results
-        formatted_results = price_comparison.format_comparison_results(products_with_affiliate, language)
-        
-        # Create message with comparison results
-        comparison_message = TranslationManager.format_price_comparison_message(formatted_results, language)
-        
-        # Create inline keyboard with affiliate links
-        keyboard = []
-        
-        # Add button for cheapest option
-        if formatted_results:
-            cheapest = formatted_results[0]
-            keyboard.append([
-                InlineKeyboardButton(
-                    TranslationManager.get_translation("view_product", language),
-                    url=cheapest.get('affiliate_url', cheapest.get('url', ''))
-                )
-            ])
-        
-        # Add buttons for other options
-        for product in formatted_results[1:]:
-            platform_name = TranslationManager.get_platform_name(product.get('platform', ''), language)
-            keyboard.append([
-                InlineKeyboardButton(
-                    f"{platform_name}",
-                    url=product.get('affiliate_url', product.get('url', ''))
-                )
-            ])
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        # Send comparison results with inline keyboard
-        await update.message.reply_text(
-            comparison_message,
-            reply_markup=reply_markup,
-            disable_web_page_preview=True
+
+        # Process up to five links concurrently; the cap bounds scraper
+        # fan-out while the gather keeps total latency at one pipeline's
+        # worth instead of one per link
+        results = await asyncio.gather(
+            *(_process_url(update, url, language, t) for url in urls[:5]),
+            return_exceptions=True
         )
+
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error processing {url}: {str(result)}")
     else:
         # If no URL is found, provide help
-        await update.message.reply_text(TranslationManager.get_translation("help", language))
+        await update.message.reply_text(t("help"))
 
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Log errors caused by updates."""
@@ -214,7 +250,7 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     # Try to notify the user about the error
     if update and update.effective_message:
         user_id = update.effective_user.id
-        language = user_languages.get(user_id, DEFAULT_LANGUAGE)
+        language = user_languages.get(user_id)
         
         await update.effective_message.reply_text(TranslationManager.get_translation("error_occurred", language))
 
@@ -1,13 +1,64 @@
+import asyncio
+import functools
+import heapq
 import logging
 import re
-from difflib import SequenceMatcher
+import string
 import unicodedata
 
+# Optional C-accelerated fuzzy scorer; token-set Jaccard stays the fallback
+# so the bot runs unchanged without the extra dependency
+try:
+    from rapidfuzz import fuzz as _fuzz
+except ImportError:
+    _fuzz = None
+
 logger = logging.getLogger(__name__)
 
+# Compiled once at module load; these run on every product comparison, so the
+# hot path shouldn't pay for re's pattern-cache lookup per call
+_PRICE_RE = re.compile(r'\d+\.\d+|\d+')
+_NON_WORD_RE = re.compile(r'[^\w]+')
+
+# Character table mapping ASCII punctuation to spaces; str.translate with a
+# prebuilt table runs the replacement in C, well ahead of a regex pass.
+# Underscores stay put so this path agrees with the \w-based regex below
+_PUNCT_TABLE = str.maketrans({c: ' ' for c in string.punctuation if c != '_'})
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_cached(text):
+    """Normalize one string; cached because product names repeat across searches."""
+    # ASCII fast path: casefold + translate + split/join all run in C, with
+    # no regex engine and no encode/decode round-trip
+    if text.isascii():
+        return ' '.join(text.casefold().translate(_PUNCT_TABLE).split())
+
+    # Accented text still takes the Unicode strip-and-regex route
+    text = text.lower()
+    text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
+
+    return _NON_WORD_RE.sub(' ', text).strip()
+
 class PriceComparison:
     """Class for comparing product prices across different platforms."""
-    
+
+    # Translations for platform names; built once at import instead of being
+    # re-allocated on every formatting call
+    _PLATFORM_TRANSLATIONS = {
+        'en': {
+            'amazon': 'Amazon',
+            'aliexpress': 'AliExpress',
+            'noon': 'Noon',
+            'temu': 'Temu'
+        },
+        'ar': {
+            'amazon': 'أمازون',
+            'aliexpress': 'علي إكسبريس',
+            'noon': 'نون',
+            'temu': 'تيمو'
+        }
+    }
+
     def __init__(self):
         """Initialize the price comparison module."""
         pass
@@ -25,18 +76,8 @@ class PriceComparison:
         """
         if not text:
             return ""
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove accents
-        text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
-        
-        # Remove special characters and extra spaces
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+
+        return _normalize_cached(text)
     
     @staticmethod
     def extract_numeric_price(price_str):
@@ -55,37 +96,72 @@ class PriceComparison:
         # Remove currency symbols and non-numeric characters except for decimal points
         # Replace comma with dot for decimal separator
         price_str = price_str.replace(',', '.')
-        
-        # Extract all numbers with decimal points
-        matches = re.findall(r'\d+\.\d+|\d+', price_str)
-        
-        if matches:
-            # Return the first match as a float
-            return float(matches[0])
-        
+
+        # Only the first number matters, so stop scanning at the first match
+        # instead of collecting every numeric run with findall
+        match = _PRICE_RE.search(price_str)
+
+        if match:
+            return float(match.group())
+
         return None
     
+    @staticmethod
+    def tokenize(text):
+        """
+        Normalize text and split it into a token set for similarity checks.
+
+        Args:
+            text (str): The text to tokenize
+
+        Returns:
+            frozenset: The set of normalized tokens
+        """
+        return frozenset(PriceComparison.normalize_text(text).split())
+
+    @staticmethod
+    def _product_tokens(product):
+        """Get (and cache on the product dict) the token set of a product name."""
+        tokens = product.get('_tokens')
+        if tokens is None:
+            tokens = PriceComparison.tokenize(product.get('name', ''))
+            product['_tokens'] = tokens
+        return tokens
+
+    @staticmethod
+    def _token_similarity(tokens1, tokens2):
+        """Score two token sets, using the RapidFuzz C scorer when installed."""
+        if _fuzz is not None:
+            return _fuzz.token_set_ratio(' '.join(tokens1), ' '.join(tokens2)) / 100.0
+
+        return len(tokens1 & tokens2) / len(tokens1 | tokens2)
+
     @staticmethod
     def calculate_similarity(text1, text2):
         """
         Calculate similarity between two text strings.
-        
+
+        Uses token-set Jaccard similarity: set intersection/union run in C and
+        scale linearly with title length, unlike the quadratic SequenceMatcher,
+        and token overlap matches reordered product titles better anyway.
+
         Args:
             text1 (str): First text string
             text2 (str): Second text string
-            
+
         Returns:
             float: Similarity score between 0 and 1
         """
         if not text1 or not text2:
             return 0
-        
-        # Normalize texts
-        norm_text1 = PriceComparison.normalize_text(text1)
-        norm_text2 = PriceComparison.normalize_text(text2)
-        
-        # Calculate similarity using SequenceMatcher
-        return SequenceMatcher(None, norm_text1, norm_text2).ratio()
+
+        tokens1 = PriceComparison.tokenize(text1)
+        tokens2 = PriceComparison.tokenize(text2)
+
+        if not tokens1 or not tokens2:
+            return 0
+
+        return PriceComparison._token_similarity(tokens1, tokens2)
     
     @staticmethod
     def is_same_product(product1, product2, threshold=0.7):
@@ -102,42 +178,102 @@ class PriceComparison:
         """
         if not product1 or not product2:
             return False
-        
-        # Get product names
-        name1 = product1.get('name', '')
-        name2 = product2.get('name', '')
-        
-        # Calculate similarity
-        similarity = PriceComparison.calculate_similarity(name1, name2)
-        
+
+        # Cheap length-ratio prefilter: titles of wildly different lengths
+        # can't reach the threshold, so skip tokenizing them entirely
+        len1 = len(product1.get('name', ''))
+        len2 = len(product2.get('name', ''))
+        if not len1 or not len2:
+            return False
+        if min(len1, len2) / max(len1, len2) < threshold - 0.1:
+            return False
+
+        # Compare cached token sets; tokenizing happens at most once per product
+        tokens1 = PriceComparison._product_tokens(product1)
+        tokens2 = PriceComparison._product_tokens(product2)
+
+        # Require at least one shared token before computing the full ratio
+        if not tokens1 & tokens2:
+            return False
+
+        similarity = PriceComparison._token_similarity(tokens1, tokens2)
+
         return similarity >= threshold
     
-    def find_similar_products(self, source_product, candidate_products, threshold=0.7):
+    @staticmethod
+    def _filter_similar(src_tokens, src_len, candidate_products, threshold=0.7):
         """
-        Find products similar to the source product from a list of candidates.
-        
+        Filter candidates against precomputed source tokens and name length.
+
+        The source side is normalized exactly once by the caller, so each
+        candidate costs one tokenization plus cheap set operations instead of
+        re-deriving the source on every comparison.
+
         Args:
-            source_product (dict): Source product details
+            src_tokens (frozenset): Token set of the source product name
+            src_len (int): Length of the source product name
             candidate_products (list): List of candidate product details
             threshold (float): Similarity threshold (0-1)
-            
+
         Returns:
             list: List of similar products
         """
         similar_products = []
-        
+
+        if not src_tokens or not src_len:
+            return similar_products
+
         for product in candidate_products:
-            if self.is_same_product(source_product, product, threshold):
+            name_len = len(product.get('name', ''))
+            if not name_len:
+                continue
+
+            # Length-ratio prefilter: wildly different titles can't reach the
+            # threshold, so skip tokenizing them entirely
+            if min(src_len, name_len) / max(src_len, name_len) < threshold - 0.1:
+                continue
+
+            tokens = PriceComparison._product_tokens(product)
+
+            # Require at least one shared token before the full ratio
+            if not src_tokens & tokens:
+                continue
+
+            if PriceComparison._token_similarity(src_tokens, tokens) >= threshold:
                 similar_products.append(product)
-        
+
         return similar_products
+
+    def find_similar_products(self, source_product, candidate_products, threshold=0.7):
+        """
+        Find products similar to the source product from a list of candidates.
+
+        Args:
+            source_product (dict): Source product details
+            candidate_products (list): List of candidate product details
+            threshold (float): Similarity threshold (0-1)
+
+        Returns:
+            list: List of similar products
+        """
+        if not source_product:
+            return []
+
+        # Tokenize the source once; the filter only ever tokenizes candidates
+        src_tokens = self._product_tokens(source_product)
+        src_len = len(source_product.get('name', ''))
+
+        return self._filter_similar(src_tokens, src_len, candidate_products, threshold)
     
-    def compare_prices(self, products):
+    def compare_prices(self, products, top_k=None):
         """
         Compare prices of products and sort by price.
         
         Args:
             products (list): List of product details
+            top_k (int, optional): If set, return only the cheapest top_k
+                products; heap selection runs in O(N log k) instead of the
+                O(N log N) full sort
             
         Returns:
             list: List of products sorted by price (cheapest first)
@@ -154,93 +290,109 @@ class PriceComparison:
                 product['numeric_price'] = numeric_price
                 products_with_price.append(product)
         
+        # Only the displayed head of the list is needed by the bot UI
+        if top_k is not None:
+            return heapq.nsmallest(top_k, products_with_price, key=lambda x: x['numeric_price'])
+
         # Sort products by price
         sorted_products = sorted(products_with_price, key=lambda x: x['numeric_price'])
         
         return sorted_products
     
-    def search_across_platforms(self, source_product, scrapers):
+    @staticmethod
+    async def _search_platform(scraper, query):
+        """Run one platform search without blocking the event loop."""
+        # Scrapers expose an async entry point that bounds per-platform
+        # concurrency and offloads the blocking fetch to a worker thread
+        search_async = getattr(scraper, 'search_product_async', None)
+        if search_async is not None:
+            return await search_async(query)
+
+        search_product = scraper.search_product
+        if asyncio.iscoroutinefunction(search_product):
+            return await search_product(query)
+
+        return await asyncio.to_thread(search_product, query)
+
+    async def search_across_platforms(self, source_product, scrapers):
         """
-        Search for a product across different platforms.
-        
+        Search for a product across different platforms concurrently.
+
+        All platform searches run in parallel via asyncio.gather, so the
+        wall-clock cost is the slowest platform rather than the sum of all.
+
         Args:
             source_product (dict): Source product details
             scrapers (dict): Dictionary of platform scrapers
-            
+
         Returns:
             list: List of similar products from different platforms
         """
         similar_products = []
-        
+
         # Add source product to the list
         similar_products.append(source_product)
-        
+
         # Get product name for search
         product_name = source_product.get('name', '')
         if not product_name:
             return similar_products
-        
+
         # Create search query from product name
         # Remove brand names and common words to improve search results
         search_query = product_name
-        
-        # Search on each platform except the source platform
+
+        # Search on every platform except the source platform, in parallel
         source_platform = source_product.get('platform', '')
-        
-        for platform, scraper in scrapers.items():
-            if platform == source_platform:
+        targets = [
+            (platform, scraper) for platform, scraper in scrapers.items()
+            if platform != source_platform
+        ]
+
+        results = await asyncio.gather(
+            *(self._search_platform(scraper, search_query) for _, scraper in targets),
+            return_exceptions=True
+        )
+
+        # Normalize the source once up front; every platform's result list is
+        # then filtered with the same precomputed tokens and length
+        src_tokens = self._product_tokens(source_product)
+        src_len = len(product_name)
+
+        for (platform, _), search_results in zip(targets, results):
+            if isinstance(search_results, Exception):
+                logger.error(f"Error searching on {platform}: {str(search_results)}")
                 continue
-            
-            try:
-                # Search for products
-                search_results = scraper.search_product(search_query)
-                
-                # Find similar products
-                platform_similar_products = self.find_similar_products(source_product, search_results)
-                
-                # Add to the list
-                similar_products.extend(platform_similar_products)
-                
-            except Exception as e:
-                logger.error(f"Error searching on {platform}: {str(e)}")
-        
+
+            # Find similar products and add them to the list
+            similar_products.extend(
+                self._filter_similar(src_tokens, src_len, search_results)
+            )
+
         return similar_products
     
     def format_comparison_results(self, products, language='en'):
         """
         Format comparison results for display.
-        
+
+        Yields formatted products one at a time so the caller can build its
+        message text and inline keyboard in the same pass, instead of
+        traversing the product list once per output.
+
         Args:
             products (list): List of products sorted by price
             language (str): Language code ('en' or 'ar')
-            
-        Returns:
-            dict: Formatted results for display
-        """
-        # Translations for platform names
-        platform_translations = {
-            'en': {
-                'amazon': 'Amazon',
-                'aliexpress': 'AliExpress',
-                'noon': 'Noon',
-                'temu': 'Temu'
-            },
-            'ar': {
-                'amazon': 'أمازون',
-                'aliexpress': 'علي إكسبريس',
-                'noon': 'نون',
-                'temu': 'تيمو'
-            }
-        }
-        
-        formatted_results = []
-        
+
+        Yields:
+            dict: Formatted product for display
+        """
+        platform_names = self._PLATFORM_TRANSLATIONS.get(language, {})
+
         for product in products:
             platform = product.get('platform', '')
-            platform_name = platform_translations.get(language, {}).get(platform, platform)
-            
-            formatted_product = {
-                'platform': platform_name,
+
+            yield {
+                'platform': platform_names.get(platform, platform),
                 'name': product.get('name', ''),
                 'price': product.get('price', ''),
                 'rating': product.get('rating', ''),
@@ -248,7 +400,3 @@ class PriceComparison:
                 'image_url': product.get('image_url', ''),
                 'affiliate_url': product.get('affiliate_url', product.get('url', ''))
             }
-            
-            formatted_results.append(formatted_product)
-        
-        return formatted_results
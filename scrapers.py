@@ -1,487 +1,516 @@
+import asyncio
+import functools
+import json
 import os
 import logging
+import random
+import re
+import time
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter, Retry
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from urllib.parse import urlencode
+
+from caching import TTLCache
 
 logger = logging.getLogger(__name__)
 
-class ProductScraper(ABC):
-    """Abstract base class for platform-specific product scrapers."""
-    
-    @abstractmethod
-    def get_product_details(self, product_id):
-        """
-        Get product details from the platform.
-        
-        Args:
-            product_id (str): The product ID to look up
-            
-        Returns:
-            dict: Product details including name, price, rating, etc.
-        """
+# Connect/read timeouts for every scraper request; without these a stalled
+# host would hold a worker indefinitely
+_REQUEST_TIMEOUT = (3, 10)
+
+# Browser User-Agent shared by all scrapers; installed once per session so
+# individual requests carry no per-call header merging
+_DEFAULT_UA = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Refuse to download bodies larger than this; product pages run 1-3 MB and
+# anything bigger is either an error page or a tarpit
+_MAX_RESPONSE_BYTES = 3_000_000
+
+def _build_session():
+    """
+    Build a pooled HTTP session for a scraper.
+
+    One session per scraper keeps TCP+TLS connections alive between calls to
+    the same host, and the mounted adapter retries transient upstream errors
+    with backoff instead of failing the whole lookup.
+
+    Returns:
+        requests.Session: The configured session
+    """
+    session = requests.Session()
+    session.headers['User-Agent'] = _DEFAULT_UA
+
+    # Product pages compress 4-6x under Brotli; advertise it (urllib3
+    # decodes br/zstd once the brotli and zstandard packages are installed)
+    session.headers['Accept-Encoding'] = 'gzip, deflate, br, zstd'
+
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[502, 504]
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+# Scrape results are pure functions of the fetched URL, so hot products and
+# repeated queries skip both the network fetch and the parse entirely. The
+# lock matters because scrapers run in worker threads.
+_DETAILS_CACHE = TTLCache(maxsize=1024, ttl=600)
+_SEARCH_CACHE = TTLCache(maxsize=1024, ttl=600)
+_CACHE_LOCK = Lock()
+
+# Selector compilation is not free: each soup.select_one(str) call re-runs
+# soupsieve's CSS parser. Compile each selector once per process instead.
+@functools.lru_cache(maxsize=256)
+def _sel(selector):
+    """Compile (once) a CSS selector into a reusable SoupSieve matcher."""
+    return soupsieve.compile(selector)
+
+# Product-id extractors used inside the per-card search loops; compiled once
+# so the loops run a bare pattern.search instead of re-resolving the pattern
+_ALI_ITEM_ID_RE = re.compile(r'/item/(\d+)\.html')
+_NOON_ID_RE = re.compile(r'/([A-Za-z0-9]+)(?:\?.*)?$')
+_TEMU_ID_RE = re.compile(r'product_([0-9]+)\.html')
+
+# Parse-time filters for the search pages: only the product-card subtrees
+# are materialized into the tree, so the bulk of each (large) results page
+# is discarded during parsing instead of built and then ignored
+_AMAZON_SEARCH_STRAINER = SoupStrainer('div', attrs={'data-asin': True})
+_ALIEXPRESS_SEARCH_STRAINER = SoupStrainer(class_='product-card')
+_NOON_SEARCH_STRAINER = SoupStrainer(attrs={'data-qa': 'product-card'})
+_TEMU_SEARCH_STRAINER = SoupStrainer(class_='product-item')
+
+def _extract_json_ld_product(soup):
+    """
+    Extract product fields from an embedded JSON-LD Product schema.
+
+    Most of the meta-tag platforms embed a schema.org Product object in a
+    <script type="application/ld+json"> tag; one json.loads of that blob is
+    cheaper than several selector walks and carries ratings the meta tags
+    lack.
+
+    Args:
+        soup (BeautifulSoup): The parsed product page
+
+    Returns:
+        dict: Any of 'name', 'price', 'rating', 'image_url' found; empty
+        when the page embeds no product schema
+    """
+    schema = None
+
+    for script in soup.find_all('script', type='application/ld+json'):
+        text = script.string
+        if not text:
+            continue
+
+        try:
+            data = json.loads(text)
+        except ValueError:
+            continue
+
+        for item in (data if isinstance(data, list) else [data]):
+            if isinstance(item, dict) and item.get('@type') == 'Product':
+                schema = item
+                break
+
+        if schema is not None:
+            break
+
+    if schema is None:
+        return {}
+
+    fields = {}
+
+    if schema.get('name'):
+        fields['name'] = schema['name']
+
+    offers = schema.get('offers')
+    if isinstance(offers, list) and offers:
+        offers = offers[0]
+    if isinstance(offers, dict) and offers.get('price') is not None:
+        price = str(offers['price'])
+        currency = offers.get('priceCurrency')
+        fields['price'] = f"{price} {currency}" if currency else price
+
+    rating = schema.get('aggregateRating')
+    if isinstance(rating, dict) and rating.get('ratingValue') is not None:
+        fields['rating'] = str(rating['ratingValue'])
+
+    image = schema.get('image')
+    if isinstance(image, list) and image:
+        image = image[0]
+    if isinstance(image, str):
+        fields['image_url'] = image
+
+    return fields
+
+def _parse_og(soup):
+    """
+    Collect every <meta property=...> tag's content in a single tree walk.
+
+    The meta-tag platforms read three or four og: properties per page; one
+    find_all pass replaces a full tree traversal per property.
+
+    Args:
+        soup (BeautifulSoup): The parsed product page
+
+    Returns:
+        dict: Mapping of meta property names to their content values
+    """
+    return {
+        meta['property']: meta.get('content')
+        for meta in soup.find_all('meta', property=True)
+    }
+
+def _retry_after_seconds(value):
+    """
+    Parse a Retry-After header into seconds.
+
+    Args:
+        value (str or None): Header value, either delta-seconds or an HTTP date
+
+    Returns:
+        float or None: Seconds to wait, or None if absent/unparseable
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
         pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+# Lazily-created worker processes for the CPU-bound detail parsing; the
+# parse functions below must stay top-level so they pickle cleanly
+_PARSE_POOL = None
+_PARSE_POOL_LOCK = Lock()
+
+def _parse_pool():
+    """Get (creating on first use) the shared parsing process pool."""
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        # First use can race across to_thread workers; without the lock two
+        # threads could each build a pool and one would leak its processes
+        with _PARSE_POOL_LOCK:
+            if _PARSE_POOL is None:
+                _PARSE_POOL = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+    return _PARSE_POOL
+
+def _parse_amazon_detail(product_id, url, content):
+    """Parse an Amazon product page into a details dict (runs in the parse pool)."""
+    soup = BeautifulSoup(content, 'lxml')
     
-    @abstractmethod
-    def search_product(self, query):
-        """
-        Search for products using a query string.
-        
-        Args:
-            query (str): The search query
-            
-        Returns:
-            list: List of product results
-        """
-        pass
+    # Extract product name
+    product_name_elem = _sel('#productTitle').select_one(soup)
+    product_name = product_name_elem.get_text().strip() if product_name_elem else "Unknown Product"
     
-    @abstractmethod
-    def generate_affiliate_link(self, product_id):
-        """
-        Generate an affiliate link for the product.
-        
-        Args:
-            product_id (str): The product ID
-            
-        Returns:
-            str: The affiliate link
-        """
-        pass
+    # Extract price
+    price_elem = _sel('.a-price .a-offscreen').select_one(soup)
+    price = (price_elem.string or price_elem.get_text()).strip() if price_elem else "Price not available"
+    
+    # Extract rating
+    rating_elem = _sel('#acrPopover').select_one(soup)
+    rating = rating_elem.get('title', 'No ratings').strip() if rating_elem else "No ratings"
+    
+    # Extract image URL
+    image_elem = _sel('#landingImage').select_one(soup)
+    image_url = image_elem.get('src') if image_elem else None
+    
+    return {
+        'success': True,
+        'platform': 'amazon',
+        'product_id': product_id,
+        'name': product_name,
+        'price': price,
+        'rating': rating,
+        'image_url': image_url,
+        'url': url
+    }
 
 
-class AmazonScraper(ProductScraper):
-    """Scraper for Amazon products using Amazon PA-API."""
+def _parse_aliexpress_detail(product_id, url, content):
+    """Parse an AliExpress product page into a details dict (runs in the parse pool)."""
+    soup = BeautifulSoup(content, 'lxml')
     
-    def __init__(self):
-        self.access_key = os.getenv("AMAZON_ACCESS_KEY")
-        self.secret_key = os.getenv("AMAZON_SECRET_KEY")
-        self.partner_tag = os.getenv("AMAZON_PARTNER_TAG")
-        self.affiliate_id = os.getenv("AMAZON_AFFILIATE_ID")
-        
-        # Check if credentials are available
-        self.api_available = all([self.access_key, self.secret_key, self.partner_tag])
-        
-        # User agent for requests
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+    # Collect all meta properties in one pass
+    og = _parse_og(soup)
+
+    product_name = og.get('og:title') or "Unknown Product"
+
+    price = og.get('og:price:amount') or "Price not available"
+    currency = og.get('og:price:currency')
+    if currency and price != "Price not available":
+        price = f"{price} {currency}"
+
+    image_url = og.get('og:image')
+    rating = "Rating not available"
+
+    # Prefer the JSON-LD product schema over the meta tags wherever
+    # it is present
+    ld = _extract_json_ld_product(soup)
+    product_name = ld.get('name', product_name)
+    price = ld.get('price', price)
+    rating = ld.get('rating', rating)
+    image_url = ld.get('image_url', image_url)
     
-    def get_product_details(self, product_id):
-        """
-        Get Amazon product details using PA-API or fallback to scraping.
-        
-        Args:
-            product_id (str): The Amazon ASIN
-            
-        Returns:
-            dict: Product details
-        """
-        if self.api_available:
-            # TODO: Implement PA-API request
-            # This would require the python-amazon-paapi library or custom implementation
-            # For now, we'll use a placeholder
-            logger.info(f"PA-API would be used for product {product_id}")
-            
-        # Fallback to scraping if API is not available or fails
-        try:
-            url = f"https://www.amazon.com/dp/{product_id}"
-            response = requests.get(url, headers=self.headers)
-            
-            if response.status_code != 200:
-                return {
-                    'success': False,
-                    'error': 'request_failed',
-                    'message': f'Failed to fetch product data: {response.status_code}'
-                }
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract product name
-            product_name_elem = soup.select_one('#productTitle')
-            product_name = product_name_elem.get_text().strip() if product_name_elem else "Unknown Product"
-            
-            # Extract price
-            price_elem = soup.select_one('.a-price .a-offscreen')
-            price = price_elem.get_text().strip() if price_elem else "Price not available"
-            
-            # Extract rating
-            rating_elem = soup.select_one('#acrPopover')
-            rating = rating_elem.get('title', 'No ratings').strip() if rating_elem else "No ratings"
-            
-            # Extract image URL
-            image_elem = soup.select_one('#landingImage')
-            image_url = image_elem.get('src') if image_elem else None
-            
-            return {
-                'success': True,
-                'platform': 'amazon',
-                'product_id': product_id,
-                'name': product_name,
-                'price': price,
-                'rating': rating,
-                'image_url': image_url,
-                'url': url
-            }
-            
-        except Exception as e:
-            logger.error(f"Error scraping Amazon product {product_id}: {str(e)}")
-            return {
-                'success': False,
-                'error': 'scraping_error',
-                'message': f'Error scraping product data: {str(e)}'
-            }
+    return {
+        'success': True,
+        'platform': 'aliexpress',
+        'product_id': product_id,
+        'name': product_name,
+        'price': price,
+        'rating': rating,
+        'image_url': image_url,
+        'url': url
+    }
+
+
+def _parse_noon_detail(product_id, url, content):
+    """Parse a Noon product page into a details dict (runs in the parse pool)."""
+    soup = BeautifulSoup(content, 'lxml')
     
-    def search_product(self, query):
-        """
-        Search for products on Amazon.
-        
-        Args:
-            query (str): The search query
-            
-        Returns:
-            list: List of product results
-        """
-        if self.api_available:
-            # TODO: Implement PA-API search
-            # For now, we'll use a placeholder
-            logger.info(f"PA-API would be used for search: {query}")
-        
-        # Fallback to scraping
-        try:
-            search_url = f"https://www.amazon.com/s?k={query.replace(' ', '+')}"
-            response = requests.get(search_url, headers=self.headers)
-            
-            if response.status_code != 200:
-                return []
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            products = []
-            
-            # Find product cards
-            product_cards = soup.select('.s-result-item[data-asin]:not([data-asin=""])')
-            
-            for card in product_cards[:5]:  # Limit to first 5 results
-                asin = card.get('data-asin')
-                
-                # Extract product name
-                name_elem = card.select_one('h2 a span')
-                name = name_elem.get_text().strip() if name_elem else "Unknown Product"
-                
-                # Extract price
-                price_elem = card.select_one('.a-price .a-offscreen')
-                price = price_elem.get_text().strip() if price_elem else "Price not available"
-                
-                # Extract rating
-                rating_elem = card.select_one('.a-icon-star-small')
-                rating = rating_elem.get_text().strip() if rating_elem else "No ratings"
-                
-                # Extract image URL
-                image_elem = card.select_one('img.s-image')
-                image_url = image_elem.get('src') if image_elem else None
-                
-                products.append({
-                    'platform': 'amazon',
-                    'product_id': asin,
-                    'name': name,
-                    'price': price,
-                    'rating': rating,
-                    'image_url': image_url,
-                    'url': f"https://www.amazon.com/dp/{asin}"
-                })
-            
-            return products
-            
-        except Exception as e:
-            logger.error(f"Error searching Amazon for {query}: {str(e)}")
-            return []
+    # Collect all meta properties in one pass
+    og = _parse_og(soup)
+
+    product_name = og.get('og:title') or "Unknown Product"
+    image_url = og.get('og:image')
     
-    def generate_affiliate_link(self, product_id):
+    # Extract price
+    price = "Price not available"
+    price_elem = _sel('[data-qa="product-price"]').select_one(soup)
+    if price_elem:
+        price = (price_elem.string or price_elem.get_text()).strip()
+    
+    # Extract rating
+    rating = "Rating not available"
+    rating_elem = _sel('[data-qa="product-rating"]').select_one(soup)
+    if rating_elem:
+        rating = (rating_elem.string or rating_elem.get_text()).strip()
+
+    # Prefer the JSON-LD product schema over the meta tags wherever
+    # it is present
+    ld = _extract_json_ld_product(soup)
+    product_name = ld.get('name', product_name)
+    price = ld.get('price', price)
+    rating = ld.get('rating', rating)
+    image_url = ld.get('image_url', image_url)
+    
+    return {
+        'success': True,
+        'platform': 'noon',
+        'product_id': product_id,
+        'name': product_name,
+        'price': price,
+        'rating': rating,
+        'image_url': image_url,
+        'url': url
+    }
+
+
+def _parse_temu_detail(product_id, url, content):
+    """Parse a Temu product page into a details dict (runs in the parse pool)."""
+    soup = BeautifulSoup(content, 'lxml')
+    
+    # Collect all meta properties in one pass
+    og = _parse_og(soup)
+
+    product_name = og.get('og:title') or "Unknown Product"
+    image_url = og.get('og:image')
+    
+    # Extract price (Temu uses JavaScript to load prices, so this might not work reliably)
+    price = "Price not available"
+    price_elem = _sel('.price').select_one(soup)
+    if price_elem:
+        price = (price_elem.string or price_elem.get_text()).strip()
+    rating = "Rating not available"
+
+    # Prefer the JSON-LD product schema over the meta tags wherever
+    # it is present
+    ld = _extract_json_ld_product(soup)
+    product_name = ld.get('name', product_name)
+    price = ld.get('price', price)
+    rating = ld.get('rating', rating)
+    image_url = ld.get('image_url', image_url)
+    
+    return {
+        'success': True,
+        'platform': 'temu',
+        'product_id': product_id,
+        'name': product_name,
+        'price': price,
+        'rating': rating,
+        'image_url': image_url,
+        'url': url
+    }
+
+class ProductScraper(ABC):
+    """Abstract base class for platform-specific product scrapers."""
+
+    # Upper bound on in-flight requests per platform, so a burst of messages
+    # can't open unbounded connections to one host
+    _MAX_CONCURRENT_REQUESTS = 5
+
+    # Created lazily on first async use so it binds to the running event loop
+    _semaphore = None
+
+    # Statuses that mean "back off", handled with Retry-After and pacing
+    _THROTTLE_STATUSES = frozenset({429, 503})
+    _MAX_THROTTLE_RETRIES = 3
+
+    # Current self-imposed delay before each request; grows multiplicatively
+    # when the host throttles us and shrinks additively as requests succeed,
+    # so load self-regulates instead of hammering a host that said stop
+    _pace_delay = 0.0
+
+    def _get(self, url, headers=None):
         """
-        Generate an Amazon affiliate link.
-        
+        GET a URL through the pooled session, backing off when throttled.
+
+        On 429/503 the Retry-After header is honored (falling back to
+        exponential delays) and the request retried a few times, instead of
+        surfacing an empty result that makes the caller retry immediately.
+
         Args:
-            product_id (str): The Amazon ASIN
-            
+            url (str): The URL to fetch
+            headers (dict, optional): Extra headers for this request only
+
         Returns:
-            str: The affiliate link
+            requests.Response: The final response
         """
-        if not self.partner_tag:
-            return f"https://www.amazon.com/dp/{product_id}"
-        
-        return f"https://www.amazon.com/dp/{product_id}?tag={self.partner_tag}"
+        for attempt in range(self._MAX_THROTTLE_RETRIES + 1):
+            if self._pace_delay:
+                time.sleep(self._pace_delay + random.uniform(0, 0.25))
 
+            # Streaming defers the body download until the caller reads
+            # .content, which lets oversized responses be rejected from the
+            # headers alone
+            response = self.session.get(url, headers=headers, timeout=_REQUEST_TIMEOUT, stream=True)
 
-class AliExpressScraper(ProductScraper):
-    """Scraper for AliExpress products."""
-    
-    def __init__(self):
-        self.api_key = os.getenv("ALIEXPRESS_API_KEY")
-        self.tracking_id = os.getenv("ALIEXPRESS_TRACKING_ID")
-        self.affiliate_id = os.getenv("ALIEXPRESS_AFFILIATE_ID")
-        
-        # Check if credentials are available
-        self.api_available = all([self.api_key, self.tracking_id])
-        
-        # User agent for requests
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-    
-    def get_product_details(self, product_id):
+            if response.status_code not in self._THROTTLE_STATUSES:
+                # Additive decrease back toward full speed
+                self._pace_delay = max(self._pace_delay - 0.1, 0.0)
+
+                content_length = int(response.headers.get('Content-Length') or 0)
+                if content_length > _MAX_RESPONSE_BYTES:
+                    response.close()
+                    raise ValueError(
+                        f'Response too large: {content_length} bytes from {url}'
+                    )
+
+                return response
+
+            # Release the throttled response's connection back to the pool
+            # before backing off
+            retry_after = response.headers.get('Retry-After')
+            response.close()
+
+            # Multiplicative increase while the host is shedding load
+            self._pace_delay = min(max(self._pace_delay * 2, 0.5), 30.0)
+
+            if attempt < self._MAX_THROTTLE_RETRIES:
+                delay = _retry_after_seconds(retry_after)
+                time.sleep((delay if delay is not None else 0.5 * 2 ** attempt)
+                           + random.uniform(0, 0.25))
+
+        return response
+
+    def _limiter(self):
+        """Get the per-scraper semaphore bounding concurrent requests."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._MAX_CONCURRENT_REQUESTS)
+        return self._semaphore
+
+    async def get_product_details_async(self, product_id):
         """
-        Get AliExpress product details.
-        
+        Async wrapper for get_product_details.
+
+        Runs the blocking fetch in a worker thread so the bot's event loop
+        stays responsive, with per-platform concurrency bounded.
+
         Args:
-            product_id (str): The AliExpress product ID
-            
+            product_id (str): The product ID to look up
+
         Returns:
-            dict: Product details
+            dict: Product details including name, price, rating, etc.
         """
-        if self.api_available:
-            # TODO: Implement AliExpress API request
-            # For now, we'll use a placeholder
-            logger.info(f"AliExpress API would be used for product {product_id}")
-        
-        # Fallback to scraping
-        try:
-            url = f"https://www.aliexpress.com/item/{product_id}.html"
-            response = requests.get(url, headers=self.headers)
-            
-            if response.status_code != 200:
-                return {
-                    'success': False,
-                    'error': 'request_failed',
-                    'message': f'Failed to fetch product data: {response.status_code}'
-                }
-            
-            # AliExpress uses JavaScript to load product data, so scraping is limited
-            # This is a simplified version that may not work reliably
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Try to extract product name from meta tags
-            product_name = "Unknown Product"
-            meta_title = soup.select_one('meta[property="og:title"]')
-            if meta_title:
-                product_name = meta_title.get('content', 'Unknown Product')
-            
-            # Try to extract price from meta tags
-            price = "Price not available"
-            meta_price = soup.select_one('meta[property="og:price:amount"]')
-            if meta_price:
-                price = meta_price.get('content', 'Price not available')
-                currency = soup.select_one('meta[property="og:price:currency"]')
-                if currency:
-                    price = f"{price} {currency.get('content', 'USD')}"
-            
-            # Extract image URL
-            image_url = None
-            meta_image = soup.select_one('meta[property="og:image"]')
-            if meta_image:
-                image_url = meta_image.get('content')
-            
-            return {
-                'success': True,
-                'platform': 'aliexpress',
-                'product_id': product_id,
-                'name': product_name,
-                'price': price,
-                'rating': "Rating not available",  # Difficult to extract reliably
-                'image_url': image_url,
-                'url': url
-            }
-            
-        except Exception as e:
-            logger.error(f"Error scraping AliExpress product {product_id}: {str(e)}")
-            return {
-                'success': False,
-                'error': 'scraping_error',
-                'message': f'Error scraping product data: {str(e)}'
-            }
-    
-    def search_product(self, query):
+        async with self._limiter():
+            return await asyncio.to_thread(self.get_product_details, product_id)
+
+    async def search_product_async(self, query):
         """
-        Search for products on AliExpress.
-        
+        Async wrapper for search_product.
+
         Args:
             query (str): The search query
-            
+
         Returns:
             list: List of product results
         """
-        if self.api_available:
-            # TODO: Implement AliExpress API search
-            # For now, we'll use a placeholder
-            logger.info(f"AliExpress API would be used for search: {query}")
-        
-        # Fallback to scraping
-        # Note: AliExpress search results are heavily JavaScript-dependent
-        # This simplified version may not work reliably
-        try:
-            search_url = f"https://www.aliexpress.com/wholesale?SearchText={query.replace(' ', '+')}"
-            response = requests.get(search_url, headers=self.headers)
-            
-            if response.status_code != 200:
-                return []
-            
-            # This is a simplified version that may not work reliably
-            # AliExpress uses JavaScript to load search results
-            soup = BeautifulSoup(response.content, 'html.parser')
-            products = []
-            
-            # Try to extract product cards
-            # This selector may need to be updated based on AliExpress's current HTML structure
-            product_cards = soup.select('.product-card')
-            
-            for card in product_cards[:5]:  # Limit to first 5 results
-                # Extract product ID from URL
-                link_elem = card.select_one('a')
-                if not link_elem or not link_elem.get('href'):
-                    continue
-                
-                href = link_elem.get('href')
-                product_id_match = re.search(r'/item/(\d+)\.html', href)
-                if not product_id_match:
-                    continue
-                
-                product_id = product_id_match.group(1)
-                
-                # Extract product name
-                name_elem = card.select_one('.product-title')
-                name = name_elem.get_text().strip() if name_elem else "Unknown Product"
-                
-                # Extract price
-                price_elem = card.select_one('.product-price')
-                price = price_elem.get_text().strip() if price_elem else "Price not available"
-                
-                # Extract image URL
-                image_elem = card.select_one('img')
-                image_url = image_elem.get('src') if image_elem else None
-                
-                products.append({
-                    'platform': 'aliexpress',
-                    'product_id': product_id,
-                    'name': name,
-                    'price': price,
-                    'rating': "Rating not available",
-                    'image_url': image_url,
-                    'url': f"https://www.aliexpress.com/item/{product_id}.html"
-                })
-            
-            return products
-            
-        except Exception as e:
-            logger.error(f"Error searching AliExpress for {query}: {str(e)}")
-            return []
-    
-    def generate_affiliate_link(self, product_id):
+        async with self._limiter():
+            return await asyncio.to_thread(self.search_product, query)
+
+    def search_and_enrich(self, query):
         """
-        Generate an AliExpress affiliate link.
-        
+        Search for products and fetch full details for every hit.
+
+        The per-hit detail pages are fetched in parallel worker threads
+        (the pooled session is thread-safe for GETs), so enriching five
+        results costs roughly one round-trip instead of five.
+
         Args:
-            product_id (str): The AliExpress product ID
-            
+            query (str): The search query
+
         Returns:
-            str: The affiliate link
+            list: List of detailed product results
         """
-        base_url = f"https://www.aliexpress.com/item/{product_id}.html"
-        
-        if not self.tracking_id:
-            return base_url
-        
-        # Add affiliate parameters
-        return f"{base_url}?aff_platform=portals-tool&sk=_dYQF9xF&aff_trace_key={self.tracking_id}"
+        cards = self.search_product(query)
 
+        if not cards:
+            return []
 
-class NoonScraper(ProductScraper):
-    """Scraper for Noon products."""
-    
-    def __init__(self):
-        self.api_key = os.getenv("NOON_API_KEY")
-        self.affiliate_id = os.getenv("NOON_AFFILIATE_ID")
-        
-        # Check if credentials are available
-        self.api_available = bool(self.api_key)
-        
-        # User agent for requests
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-    
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            return list(executor.map(
+                lambda card: self.get_product_details(card['product_id']),
+                cards
+            ))
+
+    @abstractmethod
     def get_product_details(self, product_id):
         """
-        Get Noon product details.
+        Get product details from the platform.
         
         Args:
-            product_id (str): The Noon product ID
+            product_id (str): The product ID to look up
             
         Returns:
-            dict: Product details
+            dict: Product details including name, price, rating, etc.
         """
-        if self.api_available:
-            # TODO: Implement Noon API request if available
-            # For now, we'll use a placeholder
-            logger.info(f"Noon API would be used for product {product_id}")
-        
-        # Fallback to scraping
-        try:
-            url = f"https://www.noon.com/product/{product_id}"
-            response = requests.get(url, headers=self.headers)
-            
-            if response.status_code != 200:
-                return {
-                    'success': False,
-                    'error': 'request_failed',
-                    'message': f'Failed to fetch product data: {response.status_code}'
-                }
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract product name
-            product_name = "Unknown Product"
-            meta_title = soup.select_one('meta[property="og:title"]')
-            if meta_title:
-                product_name = meta_title.get('content', 'Unknown Product')
-            
-            # Extract price
-            price = "Price not available"
-            price_elem = soup.select_one('[data-qa="product-price"]')
-            if price_elem:
-                price = price_elem.get_text().strip()
-            
-            # Extract rating
-            rating = "Rating not available"
-            rating_elem = soup.select_one('[data-qa="product-rating"]')
-            if rating_elem:
-                rating = rating_elem.get_text().strip()
-            
-            # Extract image URL
-            image_url = None
-            meta_image = soup.select_one('meta[property="og:image"]')
-            if meta_image:
-                image_url = meta_image.get('content')
-            
-            return {
-                'success': True,
-                'platform': 'noon',
-                'product_id': product_id,
-                'name': product_name,
-                'price': price,
-                'rating': rating,
-                'image_url': image_url,
-                'url': url
-            }
-            
-        except Exception as e:
-            logger.error(f"Error scraping Noon product {product_id}: {str(e)}")
-            return {
-                'success': False,
-                'error': 'scraping_error',
-                'message': f'Error scraping product data: {str(e)}'
-            }
+        pass
     
+    @abstractmethod
     def search_product(self, query):
         """
-        Search for products on Noon.
+        Search for products using a query string.
         
         Args:
             query (str): The search query
@@ -489,281 +518,379 @@ class NoonScraper(ProductScraper):
         Returns:
             list: List of product results
         """
-        if self.api_available:
-            # TODO: Implement Noon API search if available
-            # For now, we'll use a placeholder
-            logger.info(f"Noon API would be used for search: {query}")
-        
-        # Fallback to scraping
-        try:
-            search_url = f"https://www.noon.com/search?q={query.replace(' ', '+')}"
-            response = requests.get(search_url, headers=self.headers)
-            
-            if response.status_code != 200:
-                return []
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            products = []
-            
-            # Try to extract product cards
-            # This selector may need to be updated based on Noon's current HTML structure
-            product_cards = soup.select('[data-qa="product-card"]')
-            
-            for card in product_cards[:5]:  # Limit to first 5 results
-                # Extract product ID from URL
-                link_elem = card.select_one('a')
-                if not link_elem or not link_elem.get('href'):
-                    continue
-                
-                href = link_elem.get('href')
-                product_id_match = re.search(r'/([A-Za-z0-9]+)(?:\?.*)?$', href)
-                if not product_id_match:
-                    continue
-                
-                product_id = product_id_match.group(1)
-                
-                # Extract product name
-                name_elem = card.select_one('[data-qa="product-name"]')
-                name = name_elem.get_text().strip() if name_elem else "Unknown Product"
-                
-                # Extract price
-                price_elem = card.select_one('[data-qa="product-price"]')
-                price = price_elem.get_text().strip() if price_elem else "Price not available"
-                
-                # Extract rating
-                rating_elem = card.select_one('[data-qa="product-rating"]')
-                rating = rating_elem.get_text().strip() if rating_elem else "Rating not available"
-                
-                # Extract image URL
-                image_elem = card.select_one('img')
-                image_url = image_elem.get('src') if image_elem else None
-                
-                products.append({
-                    'platform': 'noon',
-                    'product_id': product_id,
-                    'name': name,
-                    'price': price,
-                    'rating': rating,
-                    'image_url': image_url,
-                    'url': f"https://www.noon.com/product/{product_id}"
-                })
-            
-            return products
-            
-        except Exception as e:
-            logger.error(f"Error searching Noon for {query}: {str(e)}")
-            return []
+        pass
     
+    @abstractmethod
     def generate_affiliate_link(self, product_id):
         """
-        Generate a Noon affiliate link.
+        Generate an affiliate link for the product.
         
         Args:
-            product_id (str): The Noon product ID
+            product_id (str): The product ID
             
         Returns:
             str: The affiliate link
         """
-        base_url = f"https://www.noon.com/product/{product_id}"
-        
-        if not self.affiliate_id:
-            return base_url
-        
-        # Add affiliate parameters
-        return f"{base_url}?utm_source=affiliate&utm_medium=cps&utm_campaign={self.affiliate_id}"
+        pass
 
 
-class TemuScraper(ProductScraper):
-    """Scraper for Temu products."""
-    
-    def __init__(self):
-        self.api_key = os.getenv("TEMU_API_KEY")
-        self.affiliate_id = os.getenv("TEMU_AFFILIATE_ID")
-        
+# Everything platform-specific lives in this table: URL templates, search
+# selectors, and credential names. The fetch/cache/throttle/parse machinery
+# above exists exactly once and is driven by whichever entry a scraper holds.
+_PLATFORMS = {
+    'amazon': {
+        'label': 'Amazon',
+        'api_label': 'PA-API',
+        'credential_env': ('AMAZON_ACCESS_KEY', 'AMAZON_SECRET_KEY', 'AMAZON_PARTNER_TAG'),
+        'affiliate_env': 'AMAZON_PARTNER_TAG',
+        'detail_url': 'https://www.amazon.com/dp/{product_id}',
+        'affiliate_url': 'https://www.amazon.com/dp/{product_id}?tag={affiliate_id}',
+        'search_url': 'https://www.amazon.com/s',
+        'query_key': 'k',
+        'detail_parser': _parse_amazon_detail,
+        'search_strainer': _AMAZON_SEARCH_STRAINER,
+        'card_selector': '.s-result-item[data-asin]:not([data-asin=""])',
+        'card_id_attr': 'data-asin',
+        'card_name_selector': 'h2 a span',
+        'card_price_selector': '.a-price .a-offscreen',
+        'card_rating_selector': '.a-icon-star-small',
+        'card_image_selector': 'img.s-image',
+        'no_rating': 'No ratings'
+    },
+    'aliexpress': {
+        'label': 'AliExpress',
+        'api_label': 'AliExpress API',
+        'credential_env': ('ALIEXPRESS_API_KEY', 'ALIEXPRESS_TRACKING_ID'),
+        'affiliate_env': 'ALIEXPRESS_TRACKING_ID',
+        'detail_url': 'https://www.aliexpress.com/item/{product_id}.html',
+        'affiliate_url': 'https://www.aliexpress.com/item/{product_id}.html'
+                         '?aff_platform=portals-tool&sk=_dYQF9xF&aff_trace_key={affiliate_id}',
+        'search_url': 'https://www.aliexpress.com/wholesale',
+        'query_key': 'SearchText',
+        'detail_parser': _parse_aliexpress_detail,
+        'search_strainer': _ALIEXPRESS_SEARCH_STRAINER,
+        'card_selector': '.product-card',
+        'card_id_pattern': _ALI_ITEM_ID_RE,
+        'card_name_selector': '.product-title',
+        'card_price_selector': '.product-price',
+        'card_image_selector': 'img',
+        'no_rating': 'Rating not available'
+    },
+    'noon': {
+        'label': 'Noon',
+        'api_label': 'Noon API',
+        'credential_env': ('NOON_API_KEY',),
+        'affiliate_env': 'NOON_AFFILIATE_ID',
+        'detail_url': 'https://www.noon.com/product/{product_id}',
+        'affiliate_url': 'https://www.noon.com/product/{product_id}'
+                         '?utm_source=affiliate&utm_medium=cps&utm_campaign={affiliate_id}',
+        'search_url': 'https://www.noon.com/search',
+        'query_key': 'q',
+        'detail_parser': _parse_noon_detail,
+        'search_strainer': _NOON_SEARCH_STRAINER,
+        'card_selector': '[data-qa="product-card"]',
+        'card_id_pattern': _NOON_ID_RE,
+        'card_name_selector': '[data-qa="product-name"]',
+        'card_price_selector': '[data-qa="product-price"]',
+        'card_rating_selector': '[data-qa="product-rating"]',
+        'card_image_selector': 'img',
+        'no_rating': 'Rating not available'
+    },
+    'temu': {
+        'label': 'Temu',
+        'api_label': 'Temu API',
+        'credential_env': ('TEMU_API_KEY',),
+        'affiliate_env': 'TEMU_AFFILIATE_ID',
+        'detail_url': 'https://www.temu.com/product_{product_id}.html',
+        'affiliate_url': 'https://www.temu.com/product_{product_id}.html?refer_key={affiliate_id}',
+        'search_url': 'https://www.temu.com/search_result.html',
+        'query_key': 'search_key',
+        'detail_parser': _parse_temu_detail,
+        'search_strainer': _TEMU_SEARCH_STRAINER,
+        'card_selector': '.product-item',
+        'card_id_pattern': _TEMU_ID_RE,
+        'card_name_selector': '.product-title',
+        'card_price_selector': '.price',
+        'card_image_selector': 'img',
+        'no_rating': 'Rating not available'
+    }
+}
+
+
+class ConfiguredScraper(ProductScraper):
+    """Scraper whose platform specifics come from a _PLATFORMS entry."""
+
+    def __init__(self, platform):
+        """
+        Initialize the scraper for one platform.
+
+        Args:
+            platform (str): Key into _PLATFORMS
+        """
+        self.platform = platform
+        self.config = _PLATFORMS[platform]
+
         # Check if credentials are available
-        self.api_available = bool(self.api_key)
-        
-        # User agent for requests
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-    
+        self.api_available = all(
+            os.getenv(name) for name in self.config['credential_env']
+        )
+        self.affiliate_id = os.getenv(self.config['affiliate_env'])
+
+        # Pooled session with keep-alive, retry-with-backoff, and the
+        # shared User-Agent installed once
+        self.session = _build_session()
+
     def get_product_details(self, product_id):
         """
-        Get Temu product details.
-        
+        Get product details from the platform.
+
         Args:
-            product_id (str): The Temu product ID
-            
+            product_id (str): The product ID to look up
+
         Returns:
             dict: Product details
         """
+        config = self.config
+
         if self.api_available:
-            # TODO: Implement Temu API request if available
+            # TODO: Implement the platform API request
             # For now, we'll use a placeholder
-            logger.info(f"Temu API would be used for product {product_id}")
-        
-        # Fallback to scraping
+            logger.info(f"{config['api_label']} would be used for product {product_id}")
+
+        cache_key = (self.platform, product_id)
+        with _CACHE_LOCK:
+            cached, fresh = _DETAILS_CACHE.get_stale(cache_key)
+        if cached is not None and fresh:
+            return cached
+
+        # Fallback to scraping if the API is not available
         try:
-            url = f"https://www.temu.com/product_{product_id}.html"
-            response = requests.get(url, headers=self.headers)
-            
+            url = config['detail_url'].format(product_id=product_id)
+
+            # A stale cache entry still has value: if the page carries the
+            # same validators, a conditional GET returns an empty 304 and
+            # the cached parse can be reused as-is
+            validators = {}
+            if cached is not None:
+                if cached.get('_etag'):
+                    validators['If-None-Match'] = cached['_etag']
+                if cached.get('_last_modified'):
+                    validators['If-Modified-Since'] = cached['_last_modified']
+
+            response = self._get(url, headers=validators or None)
+
+            if response.status_code == 304 and cached is not None:
+                # Unchanged upstream; renew the TTL on the cached parse
+                with _CACHE_LOCK:
+                    _DETAILS_CACHE.set(cache_key, cached)
+                return cached
+
             if response.status_code != 200:
                 return {
                     'success': False,
                     'error': 'request_failed',
                     'message': f'Failed to fetch product data: {response.status_code}'
                 }
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract product name
-            product_name = "Unknown Product"
-            meta_title = soup.select_one('meta[property="og:title"]')
-            if meta_title:
-                product_name = meta_title.get('content', 'Unknown Product')
-            
-            # Extract price (Temu uses JavaScript to load prices, so this might not work reliably)
-            price = "Price not available"
-            price_elem = soup.select_one('.price')
-            if price_elem:
-                price = price_elem.get_text().strip()
-            
-            # Extract image URL
-            image_url = None
-            meta_image = soup.select_one('meta[property="og:image"]')
-            if meta_image:
-                image_url = meta_image.get('content')
-            
-            return {
-                'success': True,
-                'platform': 'temu',
-                'product_id': product_id,
-                'name': product_name,
-                'price': price,
-                'rating': "Rating not available",  # Difficult to extract reliably
-                'image_url': image_url,
-                'url': url
-            }
-            
+
+            # Parsing is CPU-bound and holds the GIL; handing the body to
+            # the parse pool lets concurrent platform responses use
+            # separate cores
+            details = _parse_pool().submit(
+                config['detail_parser'], product_id, url, response.content
+            ).result()
+
+            # Keep the response validators so the next stale hit can
+            # revalidate instead of refetching the whole page
+            if response.headers.get('ETag'):
+                details['_etag'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                details['_last_modified'] = response.headers['Last-Modified']
+
+            with _CACHE_LOCK:
+                _DETAILS_CACHE.set(cache_key, details)
+
+            return details
+
         except Exception as e:
-            logger.error(f"Error scraping Temu product {product_id}: {str(e)}")
+            logger.error(f"Error scraping {config['label']} product {product_id}: {str(e)}")
             return {
                 'success': False,
                 'error': 'scraping_error',
                 'message': f'Error scraping product data: {str(e)}'
             }
-    
+
+    def _card_product_id(self, card):
+        """Extract the product id from one search-result card."""
+        id_attr = self.config.get('card_id_attr')
+        if id_attr:
+            return card.get(id_attr)
+
+        link_elem = _sel('a').select_one(card)
+        if not link_elem or not link_elem.get('href'):
+            return None
+
+        match = self.config['card_id_pattern'].search(link_elem.get('href'))
+        return match.group(1) if match else None
+
     def search_product(self, query):
         """
-        Search for products on Temu.
-        
+        Search for products on the platform.
+
         Args:
             query (str): The search query
-            
+
         Returns:
             list: List of product results
         """
+        config = self.config
+
         if self.api_available:
-            # TODO: Implement Temu API search if available
+            # TODO: Implement the platform API search
             # For now, we'll use a placeholder
-            logger.info(f"Temu API would be used for search: {query}")
-        
-        # Fallback to scraping
-        # Note: Temu search results are heavily JavaScript-dependent
-        # This simplified version may not work reliably
+            logger.info(f"{config['api_label']} would be used for search: {query}")
+
+        cache_key = (self.platform, query.lower())
+        with _CACHE_LOCK:
+            cached = _SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Fallback to scraping; note that several of these platforms load
+        # search results with JavaScript, so the selectors may need updates
+        # as their HTML evolves
         try:
-            search_url = f"https://www.temu.com/search_result.html?search_key={query.replace(' ', '+')}"
-            response = requests.get(search_url, headers=self.headers)
-            
+            search_url = config['search_url'] + '?' + urlencode({config['query_key']: query})
+            response = self._get(search_url)
+
             if response.status_code != 200:
                 return []
-            
-            # This is a simplified version that may not work reliably
-            # Temu uses JavaScript to load search results
-            soup = BeautifulSoup(response.content, 'html.parser')
+
+            soup = BeautifulSoup(response.content, 'lxml', parse_only=config['search_strainer'])
             products = []
-            
-            # Try to extract product cards
-            # This selector may need to be updated based on Temu's current HTML structure
-            product_cards = soup.select('.product-item')
-            
+
+            product_cards = _sel(config['card_selector']).select(soup)
+
             for card in product_cards[:5]:  # Limit to first 5 results
-                # Extract product ID from URL
-                link_elem = card.select_one('a')
-                if not link_elem or not link_elem.get('href'):
-                    continue
-                
-                href = link_elem.get('href')
-                product_id_match = re.search(r'product_([0-9]+)\.html', href)
-                if not product_id_match:
+                product_id = self._card_product_id(card)
+                if not product_id:
                     continue
-                
-                product_id = product_id_match.group(1)
-                
+
                 # Extract product name
-                name_elem = card.select_one('.product-title')
+                name_elem = _sel(config['card_name_selector']).select_one(card)
                 name = name_elem.get_text().strip() if name_elem else "Unknown Product"
-                
+
                 # Extract price
-                price_elem = card.select_one('.price')
-                price = price_elem.get_text().strip() if price_elem else "Price not available"
-                
+                price_elem = _sel(config['card_price_selector']).select_one(card)
+                price = (price_elem.string or price_elem.get_text()).strip() if price_elem else "Price not available"
+
+                # Extract rating, for the platforms that expose one in search
+                rating = config['no_rating']
+                rating_selector = config.get('card_rating_selector')
+                if rating_selector:
+                    rating_elem = _sel(rating_selector).select_one(card)
+                    if rating_elem:
+                        rating = (rating_elem.string or rating_elem.get_text()).strip()
+
                 # Extract image URL
-                image_elem = card.select_one('img')
+                image_elem = _sel(config['card_image_selector']).select_one(card)
                 image_url = image_elem.get('src') if image_elem else None
-                
+
                 products.append({
-                    'platform': 'temu',
+                    'platform': self.platform,
                     'product_id': product_id,
                     'name': name,
                     'price': price,
-                    'rating': "Rating not available",
+                    'rating': rating,
                     'image_url': image_url,
-                    'url': f"https://www.temu.com/product_{product_id}.html"
+                    'url': config['detail_url'].format(product_id=product_id)
                 })
-            
+
+            with _CACHE_LOCK:
+                _SEARCH_CACHE.set(cache_key, products)
+
             return products
-            
+
         except Exception as e:
-            logger.error(f"Error searching Temu for {query}: {str(e)}")
+            logger.error(f"Error searching {config['label']} for {query}: {str(e)}")
             return []
-    
+
     def generate_affiliate_link(self, product_id):
         """
-        Generate a Temu affiliate link.
-        
+        Generate an affiliate link for the product.
+
         Args:
-            product_id (str): The Temu product ID
-            
+            product_id (str): The product ID
+
         Returns:
             str: The affiliate link
         """
-        base_url = f"https://www.temu.com/product_{product_id}.html"
-        
         if not self.affiliate_id:
-            return base_url
-        
-        # Add affiliate parameters
-        return f"{base_url}?refer_key={self.affiliate_id}"
+            return self.config['detail_url'].format(product_id=product_id)
+
+        return self.config['affiliate_url'].format(
+            product_id=product_id, affiliate_id=self.affiliate_id
+        )
+
+
+class AmazonScraper(ConfiguredScraper):
+    """Scraper for Amazon products using Amazon PA-API."""
+
+    def __init__(self):
+        super().__init__('amazon')
+
+
+class AliExpressScraper(ConfiguredScraper):
+    """Scraper for AliExpress products."""
 
+    def __init__(self):
+        super().__init__('aliexpress')
+
+
+class NoonScraper(ConfiguredScraper):
+    """Scraper for Noon products."""
+
+    def __init__(self):
+        super().__init__('noon')
+
+
+class TemuScraper(ConfiguredScraper):
+    """Scraper for Temu products."""
+
+    def __init__(self):
+        super().__init__('temu')
+
+
+_SCRAPER_CLASSES = {
+    'amazon': AmazonScraper,
+    'aliexpress': AliExpressScraper,
+    'noon': NoonScraper,
+    'temu': TemuScraper
+}
+
+@functools.lru_cache(maxsize=None)
+def _build_scraper(platform):
+    """Build (once) the scraper instance for a known platform name."""
+    return _SCRAPER_CLASSES[platform]()
 
 # Factory function to get the appropriate scraper
 def get_scraper(platform):
     """
     Get the appropriate scraper for a platform.
     
+    Each platform gets one long-lived instance, so scrapers can keep HTTP
+    sessions (and their connection pools) alive across messages.
+    
     Args:
         platform (str): The platform name
         
     Returns:
-        ProductScraper: The appropriate scraper instance
+        ProductScraper: The appropriate scraper instance, or None for an
+        unknown platform
     """
-    scrapers = {
-        'amazon': AmazonScraper(),
-        'aliexpress': AliExpressScraper(),
-        'noon': NoonScraper(),
-        'temu': TemuScraper()
-    }
-    
-    return scrapers.get(platform.lower())
+    # Only memoize known platforms; arbitrary names must not grow the cache
+    name = platform.lower()
+
+    if name not in _SCRAPER_CLASSES:
+        return None
+
+    return _build_scraper(name)
@@ -1,103 +1,68 @@
+import functools
+import json
 import os
-import logging
-from dotenv import load_dotenv
+import sys
 
-logger = logging.getLogger(__name__)
-
-# Load environment variables
-load_dotenv()
+# Resolved once at import and read as a module global: the helpers below hit
+# it with one LOAD_GLOBAL instead of an attribute walk through the class
+_DEFAULT_LANGUAGE: str = os.getenv("DEFAULT_LANGUAGE", "en")
 
 class TranslationManager:
     """Class for managing translations for multilingual support."""
     
-    # Default language
-    DEFAULT_LANGUAGE = os.getenv("DEFAULT_LANGUAGE", "en")
-    
-    # Supported languages
-    SUPPORTED_LANGUAGES = ["en", "ar"]
+    # Default language (kept as a class alias of the module constant)
+    DEFAULT_LANGUAGE: str = _DEFAULT_LANGUAGE
     
-    # Translations dictionary
-    translations = {
-        "en": {
-            # General messages
-            "welcome": "Welcome to the Price Comparison Bot! Send me a product link from AliExpress, Amazon, Noon, or Temu, and I'll find the best deals for you.",
-            "help": "This bot compares prices across different e-commerce platforms.\n\nCommands:\n/start - Start the bot\n/help - Show this help message\n/language - Change language\n\nJust send me a product link from AliExpress, Amazon, Noon, or Temu to get started!",
-            "language_selection": "Please select your preferred language:",
-            "english": "English",
-            "arabic": "Arabic",
-            "language_set": "Language set to English!",
-            
-            # Processing messages
-            "processing": "Processing your link... This may take a moment.",
-            "searching": "Searching for the product on other platforms...",
-            "comparing": "Comparing prices across platforms...",
-            "generating_links": "Generating affiliate links...",
-            
-            # Error messages
-            "invalid_link": "Invalid link. Please send a product link from AliExpress, Amazon, Noon, or Temu.",
-            "unsupported_platform": "Sorry, this platform is not supported yet. Currently supported platforms: AliExpress, Amazon, Noon, and Temu.",
-            "error_occurred": "An error occurred while processing your request. Please try again later.",
-            "no_results": "Sorry, I couldn't find any matching products on other platforms.",
-            
-            # Result messages
-            "results_header": "🔍 Price Comparison Results:",
-            "best_price": "Best price found on {}:",
-            "price": "Price: {}",
-            "rating": "Rating: {}",
-            "view_product": "View Product",
-            "original_product": "Original Product",
-            "cheapest_option": "💰 Cheapest Option:",
-            "other_options": "Other Options:",
-            "platform": "Platform: {}",
-            
-            # Platform names
-            "amazon": "Amazon",
-            "aliexpress": "AliExpress",
-            "noon": "Noon",
-            "temu": "Temu"
-        },
-        "ar": {
-            # General messages
-            "welcome": "مرحبًا بك في بوت مقارنة الأسعار! أرسل لي رابط منتج من AliExpress أو Amazon أو Noon أو Temu، وسأجد أفضل العروض لك.",
-            "help": "يقارن هذا البوت الأسعار عبر منصات التجارة الإلكترونية المختلفة.\n\nالأوامر:\n/start - بدء البوت\n/help - عرض رسالة المساعدة هذه\n/language - تغيير اللغة\n\nما عليك سوى إرسال رابط منتج من AliExpress أو Amazon أو Noon أو Temu للبدء!",
-            "language_selection": "يرجى اختيار لغتك المفضلة:",
-            "english": "الإنجليزية",
-            "arabic": "العربية",
-            "language_set": "تم ضبط اللغة على العربية!",
-            
-            # Processing messages
-            "processing": "جاري معالجة الرابط الخاص بك... قد يستغرق هذا لحظة.",
-            "searching": "جاري البحث عن المنتج على المنصات الأخرى...",
-            "comparing": "مقارنة الأسعار عبر المنصات...",
-            "generating_links": "إنشاء روابط الإحالة...",
-            
-            # Error messages
-            "invalid_link": "رابط غير صالح. يرجى إرسال رابط منتج من AliExpress أو Amazon أو Noon أو Temu.",
-            "unsupported_platform": "عذرًا، هذه المنصة غير مدعومة حاليًا. المنصات المدعومة حاليًا: AliExpress و Amazon و Noon و Temu.",
-            "error_occurred": "حدث خطأ أثناء معالجة طلبك. يرجى المحاولة مرة أخرى لاحقًا.",
-            "no_results": "عذرًا، لم أتمكن من العثور على أي منتجات مطابقة على المنصات الأخرى.",
-            
-            # Result messages
-            "results_header": "🔍 نتائج مقارنة الأسعار:",
-            "best_price": "أفضل سعر وجد على {}:",
-            "price": "السعر: {}",
-            "rating": "التقييم: {}",
-            "view_product": "عرض المنتج",
-            "original_product": "المنتج الأصلي",
-            "cheapest_option": "💰 الخيار الأرخص:",
-            "other_options": "خيارات أخرى:",
-            "platform": "المنصة: {}",
-            
-            # Platform names
-            "amazon": "أمازون",
-            "aliexpress": "علي إكسبريس",
-            "noon": "نون",
-            "temu": "تيمو"
-        }
-    }
+    # Supported languages; a frozenset makes the membership checks callers
+    # run against this O(1) instead of a list scan
+    SUPPORTED_LANGUAGES = frozenset({"en", "ar"})
     
+    # Per-language tables live in translations/<lang>.json and are loaded on
+    # first use, so a session that never leaves one language pays neither
+    # import time nor memory for the others
+    _TRANSLATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "translations")
+    _tables: dict = {}
+
+    @classmethod
+    def _table(cls, language: str) -> dict:
+        """
+        Get (loading on first use) the translation table for a language.
+
+        Args:
+            language (str): The language code
+
+        Returns:
+            dict: The translation table for that language
+        """
+        table = cls._tables.get(language)
+        if table is None:
+            path = os.path.join(cls._TRANSLATIONS_DIR, f"{language}.json")
+            with open(path, encoding="utf-8") as f:
+                loaded = json.load(f)
+
+            # Intern keys and the language code so every later dict probe
+            # hits CPython's pointer-identity fast path instead of a full
+            # string compare; lookup keys are interned on entry to match
+            language = sys.intern(language)
+            table = {sys.intern(key): text for key, text in loaded.items()}
+
+            cls._tables[language] = table
+            for key, text in table.items():
+                _FLAT[(language, key)] = text
+
+            # There are only a handful of (language, platform) pairs, so the
+            # fully rendered platform line is precomputed here instead of
+            # re-assembling prefix + name on every formatted message
+            platform_prefix = table.get("platform", "")
+            for platform in ("amazon", "aliexpress", "noon", "temu"):
+                _PLATFORM_LINES[(language, platform)] = (
+                    f"🏪 {platform_prefix}{table.get(platform, platform)}"
+                )
+
+        return table
+
     @classmethod
-    def get_translation(cls, key, language=None):
+    def get_translation(cls, key: str, language: str | None = None) -> str:
         """
         Get translation for a key in the specified language.
         
@@ -109,17 +74,14 @@ class TranslationManager:
             str: The translated text
         """
         if language is None:
-            language = cls.DEFAULT_LANGUAGE
+            language = _DEFAULT_LANGUAGE
         
-        # Ensure language is supported
-        if language not in cls.SUPPORTED_LANGUAGES:
-            language = cls.DEFAULT_LANGUAGE
-        
-        # Get translation
-        return cls.translations.get(language, {}).get(key, key)
+        # Get translation; _lookup falls back to the default language on its
+        # own, so no per-call supported-language scan is needed here
+        return _lookup(language, sys.intern(key))
     
     @classmethod
-    def get_platform_name(cls, platform, language=None):
+    def get_platform_name(cls, platform: str, language: str | None = None) -> str:
         """
         Get translated platform name.
         
@@ -131,17 +93,15 @@ class TranslationManager:
             str: The translated platform name
         """
         if language is None:
-            language = cls.DEFAULT_LANGUAGE
-        
-        # Ensure language is supported
-        if language not in cls.SUPPORTED_LANGUAGES:
-            language = cls.DEFAULT_LANGUAGE
+            language = _DEFAULT_LANGUAGE
         
-        # Get platform name
-        return cls.translations.get(language, {}).get(platform.lower(), platform)
+        # Get platform name; unsupported languages fall back inside _lookup
+        key = sys.intern(platform.lower())
+        translated = _lookup(language, key)
+        return translated if translated != key else platform
     
     @classmethod
-    def format_price_comparison_message(cls, products, language=None):
+    def format_price_comparison_message(cls, products: list, language: str | None = None) -> str:
         """
         Format price comparison results as a message.
         
@@ -153,36 +113,102 @@ class TranslationManager:
             str: Formatted message
         """
         if language is None:
-            language = cls.DEFAULT_LANGUAGE
-        
+            language = _DEFAULT_LANGUAGE
+
         if not products:
-            return cls.get_translation("no_results", language)
-        
-        message = [cls.get_translation("results_header", language)]
-        
-        # Add cheapest option
-        cheapest = products[0]
-        message.append(f"\n{cls.get_translation('cheapest_option', language)}")
-        message.append(f"🏷️ {cheapest.get('name', '')}")
-        message.append(f"💲 {cls.get_translation('price', language).format(cheapest.get('price', ''))}")
-        
-        if cheapest.get('rating', ''):
-            message.append(f"⭐ {cls.get_translation('rating', language).format(cheapest.get('rating', ''))}")
-        
-        platform_name = cls.get_platform_name(cheapest.get('platform', ''), language)
-        message.append(f"🏪 {cls.get_translation('platform', language).format(platform_name)}")
-        
-        # Add other options if available
-        if len(products) > 1:
-            message.append(f"\n{cls.get_translation('other_options', language)}")
-            
-            for product in products[1:]:
-                platform_name = cls.get_platform_name(product.get('platform', ''), language)
-                message.append(f"\n🏪 {platform_name}")
-                message.append(f"🏷️ {product.get('name', '')}")
-                message.append(f"💲 {product.get('price', '')}")
-                
-                if product.get('rating', ''):
-                    message.append(f"⭐ {product.get('rating', '')}")
-        
-        return "\n".join(message)
+            return _lookup(language, "no_results")
+
+        # Repack each dict into a plain (name, price, rating, platform) row;
+        # the tuple-of-tuples is hashable, so identical requests — the
+        # trending-product case — collapse to one cached render below.
+        # name/price/platform are mandatory on well-formed products, so the
+        # expected path subscripts directly; only rating is truly optional
+        try:
+            rows = tuple(
+                (
+                    product['name'],
+                    product['price'],
+                    product.get('rating', ''),
+                    product['platform'],
+                )
+                for product in products
+            )
+        except KeyError:
+            rows = tuple(
+                (
+                    product.get('name', ''),
+                    product.get('price', ''),
+                    product.get('rating', ''),
+                    product.get('platform', ''),
+                )
+                for product in products
+            )
+
+        return _render(language, rows)
+
+# Flattened (language, key) table, filled in as language files are loaded:
+# one hash probe per lookup instead of two nested .get chains
+_FLAT = {}
+
+# Prerendered "🏪 <prefix><name>" line per (language, platform); one dict
+# probe replaces a prefix lookup, a name lookup, and an f-string per message
+_PLATFORM_LINES = {}
+
+# The (language, key) space is tiny (tens of keys, two languages), so the
+# cache collapses every repeat lookup to one probe
+@functools.lru_cache(maxsize=256)
+def _lookup(language: str, key: str) -> str:
+    """Resolve one (language, key) pair, falling back to the default language."""
+    if language not in TranslationManager._tables:
+        try:
+            TranslationManager._table(language)
+        except OSError:
+            pass
+    TranslationManager._table(_DEFAULT_LANGUAGE)
+
+    # Branchless fallback: a miss on the requested language chains straight
+    # into the default-language probe instead of a membership check up front
+    return _FLAT.get((language, key)) or _FLAT.get((_DEFAULT_LANGUAGE, key), key)
+
+@functools.lru_cache(maxsize=1024)
+def _render(language: str, rows: tuple) -> str:
+    """Render the comparison message for one (language, rows) signature."""
+    price_prefix = _lookup(language, "price")
+    platform_names = {
+        platform: _lookup(language, platform)
+        for platform in ("amazon", "aliexpress", "noon", "temu")
+    }
+
+    # One f-string builds the whole cheapest-option block, and the other
+    # options are a generator joined once; no intermediate list of line
+    # fragments is appended and re-joined
+    name, price, rating, cheapest_platform = rows[0]
+    platform_key = cheapest_platform.lower()
+    platform_line = (
+        _PLATFORM_LINES.get((language, platform_key))
+        or _PLATFORM_LINES.get((_DEFAULT_LANGUAGE, platform_key))
+        or f"🏪 {_lookup(language, 'platform')}{cheapest_platform}"
+    )
+    rating_line = f"⭐ {_lookup(language, 'rating')}{rating}\n" if rating else ""
+
+    header = (
+        f"{_lookup(language, 'results_header')}\n"
+        f"\n{_lookup(language, 'cheapest_option')}\n"
+        f"🏷️ {name}\n"
+        f"💲 {price_prefix}{price}\n"
+        f"{rating_line}"
+        f"{platform_line}"
+    )
+
+    if len(rows) == 1:
+        return header
+
+    tail = "\n".join(
+        f"\n🏪 {platform_names.get(platform.lower(), platform)}\n"
+        f"🏷️ {name}\n"
+        f"💲 {price}"
+        + (f"\n⭐ {rating}" if rating else "")
+        for name, price, rating, platform in rows[1:]
+    )
+
+    return f"{header}\n\n{_lookup(language, 'other_options')}\n{tail}"
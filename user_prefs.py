@@ -0,0 +1,92 @@
+"""Bounded, persistent storage for per-user language preferences."""
+
+import logging
+import os
+import sqlite3
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Database file for persisted preferences
+_DB_PATH = os.getenv("USER_PREFS_DB", "user_prefs.db")
+
+class UserLanguageStore:
+    """LRU-bounded in-memory map of user languages, persisted to SQLite.
+
+    Reads are served from the in-memory map; writes go through to the
+    database so preferences survive restarts. Memory stays bounded no
+    matter how many users the bot accumulates.
+    """
+
+    def __init__(self, default_language, maxsize=100_000, db_path=_DB_PATH):
+        """
+        Initialize the store and hydrate the cache from disk.
+
+        Args:
+            default_language (str): Language returned for unknown users
+            maxsize (int): Maximum number of in-memory entries
+            db_path (str): Path to the SQLite database file
+        """
+        self.default_language = default_language
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS user_lang ("
+            "user_id INTEGER PRIMARY KEY, lang TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+        for user_id, lang in self._conn.execute(
+            "SELECT user_id, lang FROM user_lang LIMIT ?", (maxsize,)
+        ):
+            self._cache[user_id] = lang
+
+    def get(self, user_id):
+        """
+        Get a user's language, falling back to the default.
+
+        Args:
+            user_id (int): The Telegram user ID
+
+        Returns:
+            str: The user's language code
+        """
+        lang = self._cache.get(user_id)
+        if lang is not None:
+            self._cache.move_to_end(user_id)
+            return lang
+
+        row = self._conn.execute(
+            "SELECT lang FROM user_lang WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            return self.default_language
+
+        self._remember(user_id, row[0])
+        return row[0]
+
+    def set(self, user_id, language):
+        """
+        Set a user's language and persist it.
+
+        Args:
+            user_id (int): The Telegram user ID
+            language (str): The language code to store
+        """
+        self._remember(user_id, language)
+        self._conn.execute(
+            "INSERT INTO user_lang(user_id, lang) VALUES(?, ?) "
+            "ON CONFLICT(user_id) DO UPDATE SET lang = excluded.lang",
+            (user_id, language)
+        )
+        self._conn.commit()
+
+    def _remember(self, user_id, language):
+        """Put an entry in the cache, evicting the least recently used."""
+        self._cache[user_id] = language
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)